@@ -1,6 +1,7 @@
 import contextlib
 import logging
 import os
+import weakref
 from flask import Flask
 from data_structures import DATABASE_FILE, FLASK_INSTANCE_FOLDER, FULL_DATABASE_PATH
 from database_orm import DatabaseManager
@@ -21,6 +22,7 @@ def create_app(test_config=None):
     app.config.from_mapping(
         SQLALCHEMY_DATABASE_URI=F'sqlite:///{FULL_DATABASE_PATH}',
         SQLALCHEMY_TRACK_MODIFICATIONS=False,
+        SQLALCHEMY_ECHO=False,
     )
 
     if test_config is None:
@@ -34,6 +36,9 @@ def create_app(test_config=None):
     with contextlib.suppress(OSError):
         os.makedirs(app.instance_path)
     app.db_manager = DatabaseManager(app)
+    # release the pooled connections and free unused database pages once the app
+    # is discarded or the process exits, without keeping the app alive until then
+    weakref.finalize(app, app.db_manager.close)
     app.register_blueprint(users_bp)
     app.register_blueprint(lessons_bp)
 
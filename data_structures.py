@@ -17,6 +17,7 @@ load_dotenv()
 
 TASKS_FILE_DIRECTORY: Final = "db_data/tasks.json"
 TEMPLATED_FILE_DIRECTORY: Final = "db_data/templates.json"
+WORD_FREQ_FILE_DIRECTORY: Final = "word_freq.txt"
 DATABASE_FILE = os.getenv("DATABASE_FILE")
 FLASK_INSTANCE_FOLDER = os.getenv("FLASK_INSTANCE_FOLDER")
 OPEN_AI_KEY = os.getenv("OPEN_AI_KEY")
@@ -71,6 +72,11 @@ class LexicalItem:
     freq: int
     id: int
 
+    # ids are unique, so equal items always have equal hashes; dataclass keeps
+    # field-wise __eq__ and leaves an explicitly defined __hash__ alone
+    def __hash__(self):
+        return hash(self.id)
+
     def to_json(self):
         return {
             'item': self.item,
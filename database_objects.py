@@ -10,8 +10,11 @@ from sqlalchemy import (
     func,
     Integer,
     JSON,
+    SmallInteger,
+    String,
+    Text,
     TIMESTAMP,
-    event
+    event,
 )
 from sqlalchemy.orm import (
     DeclarativeBase,
@@ -20,6 +23,7 @@ from sqlalchemy.orm import (
     relationship,
 )
 from data_structures import (
+    MAX_USER_NAME_LENGTH,
     CorrectionStrategy,
     Language,
     TaskType,
@@ -39,7 +43,11 @@ class UserDBObj(Base):
     __tablename__ = "users"
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    user_name: Mapped[str] = mapped_column(unique=True)
+    user_name: Mapped[str] = mapped_column(
+        String(MAX_USER_NAME_LENGTH),
+        CheckConstraint(f"length(user_name) <= {MAX_USER_NAME_LENGTH}"),
+        unique=True,
+    )
 
     lessons = relationship("UserLessonDBObj", back_populates="user")
     # create_date: Mapped[datetime] = mapped_column(insert_default=func.now())
@@ -54,8 +62,8 @@ class WordDBObj(Base):
     __tablename__ = "words"
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    word: Mapped[str]
-    pos: Mapped[str]
+    word: Mapped[str] = mapped_column(String(64))
+    pos: Mapped[str] = mapped_column(String(64))
     freq: Mapped[int]
     resources = relationship("ResourceWordDBObj", back_populates="word")
     __table_args__ = (UniqueConstraint("word", "pos"),)
@@ -68,16 +76,18 @@ class LearningDataDBObj(Base):
     __tablename__ = "learning_data"
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    user_id = mapped_column(ForeignKey("users.id"))
+    user_id = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
     word_id = mapped_column(ForeignKey("words.id"))
     score: Mapped[int] = mapped_column(
-        Integer, CheckConstraint("score >= 0 AND score <= 10"), unique=False
+        SmallInteger, CheckConstraint("score >= 0 AND score <= 10")
     )
-    lesson_id = mapped_column(ForeignKey("user_lessons.id"))
+    lesson_id = mapped_column(ForeignKey("user_lessons.id", ondelete="CASCADE"), index=True)
     lesson = relationship("UserLessonDBObj", back_populates="scores")
 
     __table_args__ = (
-        Index('idx_user_word_lesson_id', 'user_id', 'word_id', 'lesson_id'),
+        # score is included so score lookups are answered from the index alone,
+        # lesson_id descending lets the latest score per word be read without sorting
+        Index('idx_user_word_lesson_score', user_id, word_id, lesson_id.desc(), score),
         UniqueConstraint("word_id", "lesson_id"),
     )
 
@@ -90,10 +100,10 @@ class TemplateDBObj(Base):
 
     id: Mapped[int] = mapped_column(primary_key=True)
     # NOTE sqlalchemy enums use enam names not values
-    task_type: Mapped[TaskType] = mapped_column(Enum(TaskType, validate_strings=True))
-    template: Mapped[str] = mapped_column(unique=True)
-    description: Mapped[str]
-    examples: Mapped[str] = mapped_column(JSON)
+    task_type: Mapped[TaskType] = mapped_column(Enum(TaskType, validate_strings=True), index=True)
+    template: Mapped[str] = mapped_column(String(256), unique=True)
+    description: Mapped[str] = mapped_column(Text)
+    examples: Mapped[List[str]] = mapped_column(JSON)
     starting_language: Mapped[Language] = mapped_column(
         Enum(Language, validate_strings=True)
     )
@@ -110,8 +120,8 @@ class TemplateParameterDBObj(Base):
     __tablename__ = "template_parameters"
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    name: Mapped[str] = mapped_column(unique=False)
-    description: Mapped[str]
+    name: Mapped[str] = mapped_column(String(64))
+    description: Mapped[str] = mapped_column(Text)
     template_id = mapped_column(ForeignKey("templates.id"))
     template = relationship("TemplateDBObj", back_populates="parameters")
     __table_args__ = (UniqueConstraint("template_id", "name"),)
@@ -125,7 +135,7 @@ class ResourceDBObj(Base):
     __tablename__ = "resources"
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    resource_text: Mapped[str]
+    resource_text: Mapped[str] = mapped_column(Text)
     words = relationship(
         "ResourceWordDBObj",
         back_populates="resources",
@@ -142,7 +152,7 @@ class ResourceWordDBObj(Base):
 
     id: Mapped[int] = mapped_column(primary_key=True)
     resource_id = mapped_column(Integer, ForeignKey("resources.id", ondelete="CASCADE"))
-    word_id = mapped_column(Integer, ForeignKey("words.id"))
+    word_id = mapped_column(Integer, ForeignKey("words.id"), index=True)
     resources = relationship("ResourceDBObj", back_populates="words")
     word = relationship("WordDBObj", back_populates="resources")
     # each word appears in a resource once only
@@ -156,8 +166,8 @@ class TaskDBObj(Base):
     __tablename__ = "tasks"
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    template_id = mapped_column(ForeignKey("templates.id"))
-    answer: Mapped[str]
+    template_id = mapped_column(ForeignKey("templates.id"), index=True)
+    answer: Mapped[str] = mapped_column(Text)
     target_words: Mapped[List["TaskTargetWordDBObj"]] = relationship(
         "TaskTargetWordDBObj", passive_deletes=True, cascade="all, delete"
     )
@@ -175,8 +185,8 @@ class TaskTargetWordDBObj(Base):
     __tablename__ = "task_target_words"
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    task_id = mapped_column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"))
-    word_id = mapped_column(Integer, ForeignKey("words.id"))
+    task_id = mapped_column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), index=True)
+    word_id = mapped_column(Integer, ForeignKey("words.id"), index=True)
     word: Mapped["WordDBObj"] = relationship("WordDBObj")
 
 
@@ -187,8 +197,8 @@ class TaskResourceDBObj(Base):
     __tablename__ = "task_resources"
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    task_id = mapped_column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"))
-    resource_id = mapped_column(Integer, ForeignKey("resources.id"))
+    task_id = mapped_column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), index=True)
+    resource_id = mapped_column(Integer, ForeignKey("resources.id"), index=True)
     parameter_id = mapped_column(Integer, ForeignKey("template_parameters.id"))
     resource: Mapped["ResourceDBObj"] = relationship("ResourceDBObj")
     parameter: Mapped["TemplateParameterDBObj"] = relationship("TemplateParameterDBObj")
@@ -205,14 +215,15 @@ class UserLessonDBObj(Base):
     __tablename__ = "user_lessons"
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    user_id = mapped_column(Integer, ForeignKey("users.id"))
+    user_id = mapped_column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
     timestamp: Mapped[datetime] = mapped_column(type_=TIMESTAMP, nullable=True)  # No default value initially
     evaluations: Mapped[List["EvaluationDBObj"]] = relationship("EvaluationDBObj", cascade="all, delete")
     scores: Mapped[List["LearningDataDBObj"]] = relationship("LearningDataDBObj", back_populates="lesson", cascade="all, delete")
     lesson_plan: Mapped["LessonPlanDBObj"] = relationship("LessonPlanDBObj", back_populates="lesson", cascade="all, delete")
     completed: Mapped[bool] = mapped_column(Boolean, default=False)
     user: Mapped["UserDBObj"] = relationship("UserDBObj", back_populates="lessons")
-    __table_args__ = (Index("idx_timestamp_desc", timestamp.desc()),) # This index is useful for accessing most recent completed lessons
+    # Serves the most recent lesson of a user without sorting, and the user_id lookups of the foreign key
+    __table_args__ = (Index("idx_user_timestamp_desc", user_id, timestamp.desc()),)
 
 # TODO test this event listener
 @event.listens_for(UserLessonDBObj, 'before_update', propagate=True)
@@ -232,7 +243,7 @@ class LessonPlanDBObj(Base):
     __tablename__ = "lesson_plans"
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    lesson_id = mapped_column(Integer, ForeignKey("user_lessons.id"))
+    lesson_id = mapped_column(Integer, ForeignKey("user_lessons.id", ondelete="CASCADE"), index=True)
 
     tasks: Mapped[List["LessonPlanTaskDBObj"]] = relationship("LessonPlanTaskDBObj", back_populates="lesson_plan", cascade="all, delete")
     lesson: Mapped["UserLessonDBObj"] = relationship("UserLessonDBObj", back_populates="lesson_plan")
@@ -245,10 +256,10 @@ class LessonPlanTaskDBObj(Base):
     __tablename__ = "lesson_plan_tasks"
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    lesson_plan_id = mapped_column(Integer, ForeignKey("lesson_plans.id"))
+    lesson_plan_id = mapped_column(Integer, ForeignKey("lesson_plans.id", ondelete="CASCADE"))
     sequence_num: Mapped[int]
     attempt_num: Mapped[int]
-    task_id = mapped_column(Integer, ForeignKey("tasks.id"), nullable=True)
+    task_id = mapped_column(Integer, ForeignKey("tasks.id"), nullable=True, index=True)
     error_correction: Mapped[CorrectionStrategy] = mapped_column(Enum(CorrectionStrategy, validate_strings=True, nullable=True))
     completed: Mapped[bool] = mapped_column(Boolean, default=False)
     task: Mapped["TaskDBObj"] = relationship("TaskDBObj", back_populates="lesson_plan_tasks")
@@ -266,7 +277,7 @@ class EvaluationDBObj(Base):
     __tablename__ = "evaluations"
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    lesson_id = mapped_column(Integer, ForeignKey("user_lessons.id"))
+    lesson_id = mapped_column(Integer, ForeignKey("user_lessons.id", ondelete="CASCADE"))
     # TODO make this reference tasks table sequence number
     sequence_number: Mapped[int] = (
         mapped_column()
@@ -284,10 +295,10 @@ class HistoryEntrieDBObj(Base):
     __tablename__ = "history_entries"
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    evaluation_id = mapped_column(Integer, ForeignKey("evaluations.id"))
+    evaluation_id = mapped_column(Integer, ForeignKey("evaluations.id", ondelete="CASCADE"))
     attempt: Mapped[int] = mapped_column()
-    task_id = mapped_column(Integer, ForeignKey("tasks.id"))
-    response: Mapped[str]
+    task_id = mapped_column(Integer, ForeignKey("tasks.id"), index=True)
+    response: Mapped[str] = mapped_column(Text)
     scores: Mapped[List["EntryScoreDBObj"]] = relationship("EntryScoreDBObj")
     __table_args__ = (UniqueConstraint("evaluation_id", "attempt"),)
 
@@ -299,10 +310,10 @@ class EntryScoreDBObj(Base): # NOTE potentially remove this table
     __tablename__ = "entry_scores"
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    history_entry_id = mapped_column(Integer, ForeignKey("history_entries.id"))
-    word_id = mapped_column(Integer, ForeignKey("words.id"))
+    history_entry_id = mapped_column(Integer, ForeignKey("history_entries.id", ondelete="CASCADE"))
+    word_id = mapped_column(Integer, ForeignKey("words.id"), index=True)
     score: Mapped[int] = mapped_column(
-        Integer, CheckConstraint("score >= 0 AND score <= 10")
+        SmallInteger, CheckConstraint("score >= 0 AND score <= 10")
     )
     # Ensuring one score per word per history entry
     __table_args__ = (UniqueConstraint("history_entry_id", "word_id"),)
\ No newline at end of file
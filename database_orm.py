@@ -1,24 +1,35 @@
+from collections import OrderedDict
 from contextlib import contextmanager
 from dataclasses import asdict, dataclass
 import json
 import os
-from typing import Any, Dict, List, Optional, Set, Tuple, TypedDict, Union
-import pandas as pd
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, TypedDict, Union
 from sqlalchemy import (
     and_,
+    exists,
     func,
     create_engine,
+    delete,
+    insert,
+    lambda_stmt,
     select,
+    tuple_,
     event,
 )
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import sessionmaker, scoped_session, selectinload, joinedload, Session
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import StaticPool
 from sqlalchemy.exc import IntegrityError
 from data_structures import (
     FULL_DATABASE_PATH,
     MAX_USER_NAME_LENGTH,
     TASKS_FILE_DIRECTORY,
     TEMPLATED_FILE_DIRECTORY,
+    WORD_FREQ_FILE_DIRECTORY,
     CorrectionStrategy,
     Language,
     LexicalItem,
@@ -60,6 +71,54 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# SQLite builds before 3.32 allow at most 999 bound parameters per statement
+SQLITE_MAX_VARIABLES = 999
+# number of rows sent per bulk INSERT when loading words, each row binds word, pos and freq
+WORD_BATCH_SIZE = SQLITE_MAX_VARIABLES // 3
+# number of rows sent per bulk INSERT of word scores, each row binds four values
+SCORE_BATCH_SIZE = SQLITE_MAX_VARIABLES // 4
+# number of rows read at a time from the word frequency file
+WORD_FILE_CHUNK_SIZE = 10000
+# connection pool settings for file based and server databases
+POOL_SIZE = 10
+POOL_MAX_OVERFLOW = 20
+POOL_TIMEOUT = 30
+POOL_RECYCLE = 1800
+
+# maximum number of words kept by DatabaseManager.get_word_by_id,
+# the oldest cached word is dropped first
+WORD_CACHE_SIZE = 10000
+
+# session.info key marking a session inside DatabaseManager.transaction()
+IN_TRANSACTION_KEY = "in_transaction"
+# session.info key with the word cache generation current when the session's
+# transaction began, see DatabaseManager._cache_word
+WORD_CACHE_GENERATION_KEY = "word_cache_generation"
+# session.info key with ids of words updated inside transaction(), evicted from
+# the word cache again once the transaction commits
+UPDATED_WORD_IDS_KEY = "updated_word_ids"
+
+# dialect specific INSERT constructs with ON CONFLICT DO UPDATE keyed by dialect name,
+# see DatabaseManager._upsert_word_batch
+UPSERT_INSERTS = {"sqlite": sqlite_insert, "postgresql": postgresql_insert}
+
+# engines of persistent databases keyed by database uri and echo, see get_db_engine
+_engines: Dict[Tuple[str, bool], Engine] = {}
+
+# loader options for task queries whose results go through convert_task_obj_to_task,
+# so the words, resources and parameters of all tasks are fetched in a few
+# IN queries instead of one lazy load per row
+TASK_LOADER_OPTIONS = (
+    selectinload(TaskDBObj.target_words).joinedload(TaskTargetWordDBObj.word),
+    selectinload(TaskDBObj.resources).options(
+        joinedload(TaskResourceDBObj.parameter),
+        joinedload(TaskResourceDBObj.resource)
+            .selectinload(ResourceDBObj.words)
+            .joinedload(ResourceWordDBObj.word),
+    ),
+    joinedload(TaskDBObj.template).selectinload(TemplateDBObj.parameters),
+)
+
 @dataclass
 class Order:
     sequence_num: int
@@ -183,16 +242,149 @@ def read_tasks_from_json(file_path: str) -> List[Task]:
 
     return tasks
 
+def read_word_chunks_from_file(file_path: str, word_limit: int) -> Iterator[List[Tuple[str, str, int]]]:
+    """
+    Reads a tab separated word frequency file with word, pos and count columns
+    and yields the first word_limit words, in file order, that occur more than twice
+    in chunks of at most WORD_FILE_CHUNK_SIZE words, so the whole file is never held in memory.
+
+    Args:
+        file_path (str): The path to the word frequency file.
+        word_limit (int): The maximum number of words to yield in total.
+
+    Yields:
+        List[Tuple[str, str, int]]: A list of (word, pos, freq) tuples.
+    """
+    if word_limit <= 0:
+        return
+    # pandas is only needed for loading the word list, so keep it out of the module import
+    import pandas as pd
+
+    remaining = word_limit
+    # the result is the first word_limit qualifying rows in file order, so the
+    # rest of the file can not change it once they have been yielded
+    for chunk in pd.read_csv(
+        file_path,
+        sep="\t",
+        dtype={"word": "string", "pos": "string", "count": "int64"},
+        keep_default_na=False,  # lemmas such as "null" are words, not missing values
+        chunksize=WORD_FILE_CHUNK_SIZE,
+    ):
+        filtered_chunk = chunk[chunk["count"] > 2].head(remaining)
+        if filtered_chunk.empty:
+            continue
+        # tolist() yields Python str and int values
+        yield list(zip(
+            filtered_chunk["word"].tolist(),
+            filtered_chunk["pos"].tolist(),
+            filtered_chunk["count"].tolist(),
+        ))
+        remaining -= len(filtered_chunk)
+        if remaining <= 0:
+            break
+
 @event.listens_for(Engine, "connect")
 def set_sqlite_pragma(dbapi_connection, connection_record):
+    # the listener is registered for every engine, other backends have no pragmas
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
     cursor = dbapi_connection.cursor()
     cursor.execute("PRAGMA foreign_keys=ON")
+    # only takes effect for a newly created database file and has to run before
+    # journal_mode=WAL, which writes the database header; freed pages are
+    # returned by DatabaseManager.close()
+    cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    # in-memory databases have no file name and nothing to journal to disk
+    main_file = next(row[2] for row in cursor.execute("PRAGMA database_list") if row[1] == "main")
+    if main_file:
+        # readers do not block the writer and commits append to the WAL instead of rewriting pages
+        cursor.execute("PRAGMA journal_mode=WAL")
+    # in WAL mode NORMAL only syncs on checkpoints and stays consistent after a crash
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")  # 256 MiB
+    cursor.execute("PRAGMA cache_size=-65536")  # 64 MiB
+    # wait for concurrent writers instead of failing instantly with "database is locked"
+    cursor.execute("PRAGMA busy_timeout=5000")
+    # checkpoint less often so bulk loads are not paused every 1000 pages
+    cursor.execute("PRAGMA wal_autocheckpoint=10000")
     cursor.close()
 
+def is_in_memory_database(database_uri: str) -> bool:
+    """
+    Checks if database_uri points to an in-memory SQLite database.
+    """
+    url = make_url(database_uri)
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+def create_db_engine(database_uri: str, echo: bool = False) -> Engine:
+    """
+    Creates an engine for database_uri with a connection pool suited to the backend.
+    echo logs every emitted statement and is meant for diagnostics only.
+
+    In-memory SQLite databases only exist for the lifetime of their connection,
+    so a single connection is shared between all threads. File based SQLite and
+    server databases use a sized QueuePool.
+    """
+    url = make_url(database_uri)
+    if is_in_memory_database(database_uri):
+        return create_engine(
+            url,
+            echo=echo,
+            insertmanyvalues_page_size=WORD_BATCH_SIZE,
+            poolclass=StaticPool,
+            connect_args={"check_same_thread": False},
+        )
+    engine_options: Dict[str, Any] = {
+        "pool_size": POOL_SIZE,
+        "max_overflow": POOL_MAX_OVERFLOW,
+        "pool_timeout": POOL_TIMEOUT,
+    }
+    if url.get_backend_name() != "sqlite":
+        # server connections can be dropped from the other side
+        engine_options.update(pool_pre_ping=True, pool_recycle=POOL_RECYCLE)
+    if url.get_driver_name() == "psycopg2":
+        # use psycopg2's fast execution helpers for executemany batches
+        engine_options.update(executemany_mode="values_plus_batch")
+    return create_engine(
+        url,
+        echo=echo,
+        insertmanyvalues_page_size=WORD_BATCH_SIZE,
+        **engine_options,
+    )
+
+def get_db_engine(database_uri: str, echo: bool = False) -> Engine:
+    """
+    Returns an engine for database_uri whose schema has been created.
+
+    Engines of persistent databases are created once per process and echo
+    setting and shared by every DatabaseManager, so the schema check runs
+    only once. Each in-memory database is a separate database and gets its
+    own engine.
+    """
+    if is_in_memory_database(database_uri):
+        engine = create_db_engine(database_uri, echo)
+        Base.metadata.create_all(engine)
+        return engine
+    key = (database_uri, echo)
+    if key not in _engines:
+        engine = create_db_engine(database_uri, echo)
+        Base.metadata.create_all(engine)
+        _engines[key] = engine
+    return _engines[key]
+
 @contextmanager
 def managed_session(session_factory: scoped_session[Session]):
-    """Context manager for managing SQLAlchemy sessions."""
+    """
+    Context manager for managing SQLAlchemy sessions.
+    Inside DatabaseManager.transaction() changes are only flushed and
+    committing or rolling back is left to the enclosing transaction.
+    """
     session = session_factory()
+    if session.info.get(IN_TRANSACTION_KEY):
+        yield session
+        session.flush()
+        return
     try:
         yield session
         session.commit()
@@ -203,14 +395,23 @@ def managed_session(session_factory: scoped_session[Session]):
 
 
 class DatabaseManager:
-    def __init__(self, app: Optional[Flask]):
+    def __init__(self, app: Optional[Flask], echo: bool = False):
+        self._closed = False
+        # words read by get_word_by_id keyed by word id, see WORD_CACHE_SIZE
+        self._word_cache: OrderedDict[int, LexicalItem] = OrderedDict()
+        # incremented whenever updated words are committed, so words read before
+        # the update are not cached afterwards
+        self._word_cache_generation = 0
+        # requests run in several threads and share the cache
+        self._word_cache_lock = threading.Lock()
         if app: 
             self.init_app(app)
         elif not os.path.exists(FULL_DATABASE_PATH):
-            engine = create_engine(f'sqlite:///{(FULL_DATABASE_PATH)}', echo=False)
-            Base.metadata.create_all(engine)
-            self.Session = scoped_session(sessionmaker(bind=engine))
-            self._prepopulate_db()
+            engine = get_db_engine(f'sqlite:///{(FULL_DATABASE_PATH)}', echo=echo)
+            self.Session = self._create_session_registry(engine)
+            # a failed initial load leaves an incomplete database either way
+            with self.bulk_mode():
+                self._prepopulate_db()
             self.shutdown_session()
             
     def _prepopulate_db(self):
@@ -222,43 +423,136 @@ class DatabaseManager:
         Returns:
             None
         """
-        word_freq_output_file_path = "word_freq.txt"
-        word_freq_df_loaded = pd.read_csv(word_freq_output_file_path, sep="\t")
-        filtered_dataframe = word_freq_df_loaded[word_freq_df_loaded["count"] > 2]
-        list_of_tuples: List[Tuple[str, str, int]] = list(filtered_dataframe.to_records(index=False))
-        # convert numpy.int64 to Python integer
-        list_of_tuples = [(word, pos, int(freq)) for (word, pos, freq) in list_of_tuples][:100]
-
-        indices = self.add_words_to_db(list_of_tuples)
-        logger.info(indices)
-
-        # add template and create template dict
-        templates = read_templates_from_json(TEMPLATED_FILE_DIRECTORY)
-        template_dict = {}
-        for template in templates:
-            added_template_id = self.add_template(template)
-            template_dict[template.get_template_string()] = added_template_id
-        tasks = read_tasks_from_json(TASKS_FILE_DIRECTORY)
-        for task in tasks:
-            task.template.id = template_dict[task.template.get_template_string()]
-            for key in task.resources.keys():
-                self.add_resource_manual(task.resources[key].resource, task.resources[key].target_words)
-            self.add_task(task.template.id, task.resources, task.learning_items, task.correctAnswer)
+        # all words, templates, resources and tasks are committed together once
+        with self.transaction():
+            # write the word file chunk by chunk
+            indices = []
+            for word_chunk in read_word_chunks_from_file(WORD_FREQ_FILE_DIRECTORY, word_limit=100):
+                indices.extend(self.add_words_to_db(word_chunk))
+            logger.info(indices)
+
+            # add template and create template dict
+            templates = read_templates_from_json(TEMPLATED_FILE_DIRECTORY)
+            template_dict = {}
+            for template in templates:
+                added_template_id = self.add_template(template)
+                template_dict[template.get_template_string()] = added_template_id
+            tasks = read_tasks_from_json(TASKS_FILE_DIRECTORY)
+            for task in tasks:
+                task.template.id = template_dict[task.template.get_template_string()]
+                for key in task.resources.keys():
+                    self.add_resource_manual(task.resources[key].resource, task.resources[key].target_words)
+                self.add_task(task.template.id, task.resources, task.learning_items, task.correctAnswer)
 
     def init_app(self, app: Flask):
-        engine = create_engine(app.config['SQLALCHEMY_DATABASE_URI'], echo=False)
-        Base.metadata.create_all(engine)
-        self.Session = scoped_session(sessionmaker(bind=engine))
+        engine = get_db_engine(
+            app.config['SQLALCHEMY_DATABASE_URI'],
+            echo=app.config.get('SQLALCHEMY_ECHO', False),
+        )
+        self.Session = self._create_session_registry(engine)
         app.teardown_appcontext(self.shutdown_session)
 
+    def _create_session_registry(self, engine: Engine) -> scoped_session[Session]:
+        """
+        Creates the thread local session registry for engine.
+        """
+        session_factory = sessionmaker(bind=engine, expire_on_commit=False)
+        event.listen(session_factory, "after_begin", self._record_word_cache_generation)
+        return scoped_session(session_factory)
+
+    def _record_word_cache_generation(self, session: Session, transaction, connection) -> None:
+        session.info[WORD_CACHE_GENERATION_KEY] = self._word_cache_generation
+
     def shutdown_session(self, exception=None):
         self.Session.remove()
 
+    def close(self):
+        """
+        Removes the session, frees unused pages of SQLite database files and
+        closes the pooled connections of the engine.
+        Meant for process shutdown, the manager can not be used afterwards.
+        Calling it again does nothing.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        engine = self.Session.get_bind()
+        self.Session.remove()
+        if engine.dialect.name == "sqlite" and not is_in_memory_database(str(engine.url)):
+            # give the pages freed by deletes back to the file system; executescript
+            # runs the pragma to completion, a plain execute frees a single page
+            with engine.connect() as connection:
+                connection.connection.driver_connection.executescript("PRAGMA incremental_vacuum;")
+        # drop the cached engine so a later manager for the same database gets a new one
+        for key, cached_engine in list(_engines.items()):
+            if cached_engine is engine:
+                del _engines[key]
+        engine.dispose()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Groups several DatabaseManager calls into one transaction which is
+        committed once when the block exits and rolled back if it raises.
+        Errors inside the block should be left to propagate, since the
+        session can not continue after a failed flush.
+        Nested blocks join the outermost transaction.
+        """
+        session = self.Session()
+        if session.info.get(IN_TRANSACTION_KEY):
+            yield
+            return
+        session.info[IN_TRANSACTION_KEY] = True
+        try:
+            yield
+            session.commit()
+            self._evict_words(session.info.get(UPDATED_WORD_IDS_KEY, ()))
+        except BaseException as e:
+            # BaseException so an interrupt or a closed generator does not
+            # leave the session in the failed transaction
+            session.rollback()
+            logger.error(f"Transaction rolled back due to error: {e!r}")
+            raise
+        finally:
+            session.info.pop(IN_TRANSACTION_KEY, None)
+            session.info.pop(UPDATED_WORD_IDS_KEY, None)
+
+    @contextmanager
+    def bulk_mode(self):
+        """
+        Turns off syncing to disk for connections used inside the block.
+        A crash during the block can corrupt the database, so it is only
+        meant for loads that can be redone from scratch.
+        The session is removed when the block exits, so its connection is
+        returned to the pool with syncing restored even after an error.
+        """
+        engine = self.Session.get_bind()
+
+        def disable_sync(dbapi_connection, connection_record, connection_proxy):
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA synchronous=OFF")
+            cursor.close()
+
+        def restore_sync(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.close()
+
+        event.listen(engine, "checkout", disable_sync)
+        event.listen(engine, "checkin", restore_sync)
+        try:
+            yield
+        finally:
+            self.shutdown_session()
+            event.remove(engine, "checkout", disable_sync)
+            event.remove(engine, "checkin", restore_sync)
+
     def add_words_to_db(self, word_list: List[Tuple[str, str, int]]) -> List[int]:
         """
         Insert tuples of (word, part-of-speech, frequency) into words table.
         If a combination of (word, pos) already exists in the database,
-        only the freq count is updated.
+        only the freq count is updated. If it appears more than once in
+        word_list, the highest freq is used.
 
         Args:
             word_list (List[Tuple[str, str, int]]): list of tuples of (word, pos, freq),
@@ -267,26 +561,86 @@ class DatabaseManager:
         Returns:
             List[int]: a list of inserted word_ids
         """
-        with managed_session(self.Session) as session:
-            word_ids = []
-            for word_tuple in word_list:
-                word, pos, freq = word_tuple
-                word_object = WordDBObj(word=word, pos=pos, freq=freq)
-                # check if combination of word-pos exist
-                try:
-                    session.add(word_object)
-                    session.flush()
-                    word_ids.append(word_object.id)
-                except IntegrityError:
-                    session.rollback()
-                    retrieved_word_obj = self.get_word_obj_by_word_and_pos(word_object.word, word_object.pos)
-                    session.add(retrieved_word_obj)
-                    if not retrieved_word_obj:
-                        raise
-                    # UPDATE word freq
-                    retrieved_word_obj.freq = freq
-                    session.flush()
-                    word_ids.append(retrieved_word_obj.id)
+        # send each word-pos combination once, keeping its highest freq
+        word_freqs: Dict[Tuple[str, str], int] = {}
+        for word, pos, freq in word_list:
+            word_freqs[(word, pos)] = max(freq, word_freqs.get((word, pos), freq))
+        unique_words = [(word, pos, freq) for (word, pos), freq in word_freqs.items()]
+
+        # all batches share the managed_session transaction and commit once
+        with managed_session(self.Session) as session, session.no_autoflush:
+            in_transaction = session.info.get(IN_TRANSACTION_KEY)
+            word_ids: Dict[Tuple[str, str], int] = {}
+            for start in range(0, len(unique_words), WORD_BATCH_SIZE):
+                word_ids.update(
+                    self._upsert_word_batch(session, unique_words[start:start + WORD_BATCH_SIZE])
+                )
+            # the upsert bypasses the identity map, so reload freq of words loaded earlier
+            for obj in list(session.identity_map.values()):
+                if isinstance(obj, WordDBObj):
+                    session.expire(obj, ["freq"])
+            self._evict_words(word_ids.values())
+            if in_transaction:
+                # evicted again when transaction() commits
+                session.info.setdefault(UPDATED_WORD_IDS_KEY, set()).update(word_ids.values())
+        if not in_transaction:
+            # a concurrent get_word_by_id may have read the old row before the commit
+            self._evict_words(word_ids.values())
+        return [word_ids[(word, pos)] for word, pos, _ in word_list]
+
+    def _upsert_word_batch(
+        self, session: Session, word_batch: List[Tuple[str, str, int]]
+    ) -> Dict[Tuple[str, str], int]:
+        """
+        Inserts or updates one batch of (word, pos, freq) tuples within the
+        caller's transaction and returns the ids keyed by (word, pos).
+        """
+        dialect = session.get_bind().dialect
+        upsert_insert = UPSERT_INSERTS.get(dialect.name)
+        if upsert_insert is None or not dialect.insert_executemany_returning:
+            return self._add_word_batch_with_mappings(session, word_batch)
+        stmt = upsert_insert(WordDBObj).values(
+            [{"word": word, "pos": pos, "freq": freq} for word, pos, freq in word_batch]
+        )
+        # UPDATE word freq of the word-pos combinations that already exist
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[WordDBObj.word, WordDBObj.pos],
+            set_={"freq": stmt.excluded.freq},
+        ).returning(WordDBObj.id, WordDBObj.word, WordDBObj.pos)
+        return {(word, pos): word_id for word_id, word, pos in session.execute(stmt)}
+
+    def _add_word_batch_with_mappings(
+        self, session: Session, word_batch: List[Tuple[str, str, int]]
+    ) -> Dict[Tuple[str, str], int]:
+        """
+        Fallback of _upsert_word_batch for dialects without an ON CONFLICT
+        upsert that returns the ids of inserted rows. Existing word-pos combinations
+        are found with one query and updated in bulk, the rest are bulk inserted.
+        Bulk mappings skip the identity map and per-object attribute tracking.
+        """
+        word_ids = {
+            (word, pos): word_id
+            for word_id, word, pos in session.execute(
+                select(WordDBObj.id, WordDBObj.word, WordDBObj.pos).where(
+                    tuple_(WordDBObj.word, WordDBObj.pos).in_(
+                        [(word, pos) for word, pos, _ in word_batch]
+                    )
+                )
+            )
+        }
+        session.bulk_update_mappings(WordDBObj, [
+            {"id": word_ids[(word, pos)], "freq": freq}
+            for word, pos, freq in word_batch
+            if (word, pos) in word_ids
+        ])
+        new_words = [
+            {"word": word, "pos": pos, "freq": freq}
+            for word, pos, freq in word_batch
+            if (word, pos) not in word_ids
+        ]
+        # return_defaults fills in the generated id of every mapping
+        session.bulk_insert_mappings(WordDBObj, new_words, return_defaults=True)
+        word_ids.update(((new_word["word"], new_word["pos"]), new_word["id"]) for new_word in new_words)
         return word_ids
 
     def get_word_obj_by_word_and_pos(self, word: str, pos: str) -> Optional[WordDBObj]:
@@ -296,8 +650,10 @@ class DatabaseManager:
             ValueError if more than one word-pos entry is found.
         """
         with managed_session(self.Session) as session:
-            stmt = select(WordDBObj).where(
-                and_(WordDBObj.word == word, WordDBObj.pos == pos)
+            stmt = lambda_stmt(
+                lambda: select(WordDBObj).where(
+                    and_(WordDBObj.word == word, WordDBObj.pos == pos)
+                )
             )
             if word_obj := session.execute(stmt).scalar_one_or_none():
                 return word_obj
@@ -305,21 +661,65 @@ class DatabaseManager:
                 raise ValueError(f"None or more than one word-pos {word}-{pos} entry found.")
 
 
-    def get_word_by_id(self, word_id: int) -> Optional[LexicalItem]:
+    def get_word_by_id(self, word_id: int) -> LexicalItem:
         """
         Gets the word from the database by word_id.
-        Returns none if the word does not exist.
+        Words are cached after the first read and evicted when add_words_to_db updates them.
+        Raises KeyError if the word does not exist.
         """
+        if (cached_word := self._get_cached_word(word_id)) is not None:
+            return cached_word
         with managed_session(self.Session) as session:
-            statement = select(WordDBObj).where(WordDBObj.id == word_id)
-            rows = session.scalars(statement).all()
-            if len(rows) == 0:
+            # select plain columns, LexicalItem does not need a tracked ORM object
+            row = session.execute(
+                lambda_stmt(
+                    lambda: select(
+                        WordDBObj.word, WordDBObj.pos, WordDBObj.freq, WordDBObj.id
+                    ).where(WordDBObj.id == word_id)
+                )
+            ).one_or_none()
+            if row is None:
                 raise KeyError(f"No such word_id {word_id} is found.")
-            elif len(rows) == 1:
-                word = rows[0]
-                return LexicalItem(word.word, word.pos, word.freq, word.id)
-            else:
-                return None
+            return self._cache_word(session, LexicalItem(*row))
+
+    def _get_cached_word(self, word_id: int) -> Optional[LexicalItem]:
+        with self._word_cache_lock:
+            return self._word_cache.get(word_id)
+
+    def _cache_word(self, session: Session, word: LexicalItem) -> LexicalItem:
+        """
+        Adds word read in session to the word cache and returns word.
+        The word is not cached if session is inside transaction(), since the
+        read may still be rolled back, or if words were updated since the
+        session's transaction began, since the read may predate the update.
+        """
+        if session.info.get(IN_TRANSACTION_KEY):
+            return word
+        with self._word_cache_lock:
+            if session.info.get(WORD_CACHE_GENERATION_KEY) == self._word_cache_generation:
+                self._word_cache[word.id] = word
+                if len(self._word_cache) > WORD_CACHE_SIZE:
+                    self._word_cache.popitem(last=False)
+        return word
+
+    def _evict_words(self, word_ids: Iterable[int]) -> None:
+        """
+        Removes updated words from the word cache.
+        """
+        with self._word_cache_lock:
+            self._word_cache_generation += 1
+            for word_id in word_ids:
+                self._word_cache.pop(word_id, None)
+
+    def _to_lexical_item(self, word_obj: WordDBObj) -> LexicalItem:
+        """
+        Returns the cached LexicalItem for word_obj, so tasks that share words share the items.
+        An uncached word_obj is converted but not cached: with expire_on_commit=False it may have
+        been loaded in an earlier transaction and still hold values from before an update.
+        """
+        if (cached_word := self._get_cached_word(word_obj.id)) is not None:
+            return cached_word
+        return LexicalItem(word_obj.word, word_obj.pos, word_obj.freq, word_obj.id)
 
     def insert_user(self, user_name: str) -> int:
         """
@@ -335,19 +735,17 @@ class DatabaseManager:
         Returns:
             int: The user ID of the newly inserted user.
         """
-        session = self.Session()
         if not isinstance(user_name, str) or len(user_name) > MAX_USER_NAME_LENGTH:
             raise ValueError("Username is not a string or too long.")
 
-        try:
-            user = UserDBObj(user_name=user_name)
-            session.add(user)
-            session.flush()
-            session.commit()
-            return user.id
-        except IntegrityError as e:
-            session.rollback()
-            raise ValueError(f"User '{user_name}' already exists in the database.") from e
+        with managed_session(self.Session) as session:
+            try:
+                user = UserDBObj(user_name=user_name)
+                session.add(user)
+                session.flush()
+                return user.id
+            except IntegrityError as e:
+                raise ValueError(f"User '{user_name}' already exists in the database.") from e
 
     def get_user_by_id(self, user_id: int) -> Optional[User]:
         """
@@ -355,28 +753,26 @@ class DatabaseManager:
 
         Args:
             user_id: int - user id
-        Raises?
 
         Returns:
-            UserDBObj: user database object
+            User: user with user_id
             None if no user is found
         """
-        session = self.Session()
-        statement = select(UserDBObj).where(UserDBObj.id == user_id)
-        rows = session.scalars(statement).all()
-        if len(rows) == 0:
-            return None
-        elif len(rows) == 1:
-            user_obj = rows[0]
-            return User(user_obj.id, user_obj.user_name)
-        else:
-            raise KeyError(f"User id {user_id} is not unique.")
+        with managed_session(self.Session) as session:
+            user_obj = session.get(UserDBObj, user_id)
+            return User(user_obj.id, user_obj.user_name) if user_obj else None
+
+    @staticmethod
+    def _user_exists(session: Session, user_id: int) -> bool:
+        """
+        Checks whether a user with user_id exists without loading the user row.
+        """
+        return session.scalar(select(exists().where(UserDBObj.id == user_id)))
 
     def remove_user(self, user_id: int) -> None:
         """
-        # TODO also delete data from the lesson data table ???
         Remove user with user_id from users table
-        and remove all associated rows in learning_data.
+        and remove all associated rows in learning_data and the user's lessons.
 
         Args:
             user_id (int): ID of the user to remove.
@@ -385,13 +781,19 @@ class DatabaseManager:
             ValueDoesNotExistInDB if the user with user_id does not exist
         """
         with managed_session(self.Session) as session:
-            if user := session.get(UserDBObj, user_id):
-                session.delete(user)
-                session.flush()
-                session.commit()
-                logger.info(f"User with ID {user_id} removed successfully.")
-            else:
+            # learning data and lessons of the user are removed by ON DELETE CASCADE
+            result = session.execute(
+                delete(UserDBObj)
+                .where(UserDBObj.id == user_id)
+                .execution_options(synchronize_session="fetch")
+            )
+            if not result.rowcount:
                 raise ValueDoesNotExistInDB(f"User with ID {user_id} does not exist.")
+            # the database side cascade bypasses the identity map, so lessons, plans and
+            # scores of the user loaded earlier would otherwise still be served; pending
+            # changes were flushed before the delete ran
+            session.expire_all()
+            logger.info(f"User with ID {user_id} removed successfully.")
 
     def add_word_score(self, user_id: int, score: Score, lesson_id: int):
         """
@@ -415,27 +817,63 @@ class DatabaseManager:
                     f"Score should be between {MIN_SCORE} and {MAX_SCORE}."
                 )
             try:
-                new_entry = LearningDataDBObj(
-                    user_id=user_id, word_id=score.word_id, score=score.score, lesson_id=lesson_id
+                # a duplicate score for the lesson fails on the unique constraint
+                word_id, score_value = score.word_id, score.score
+                session.execute(
+                    lambda_stmt(
+                        lambda: insert(LearningDataDBObj).values(
+                            user_id=user_id, word_id=word_id, score=score_value, lesson_id=lesson_id
+                        )
+                    )
                 )
-                session.add(new_entry)
-                session.flush()
-                session.commit()
             except IntegrityError as e:
-                session.rollback()
+                logger.error(e)
+                raise ValueDoesNotExistInDB("User or word or lesson id invalid.") from e
+
+    def bulk_add_word_scores(self, user_id: int, scores: Set[Score], lesson_id: int) -> None:
+        """
+        Adds the scores for several words for a particular lesson using
+        batched INSERT statements instead of one statement per score.
+        Scores should be between MIN_SCORE and MAX_SCORE.
+
+        Constraint: Should add only one score per word per lesson.
+
+        Raises:
+            ValueError if any score is outside of MIN_SCORE and MAX_SCORE.
+            ValueDoesNotExistInDB if user, a word or the lesson id is invalid
+                or a word already has a score for the lesson.
+        """
+        if any(not MIN_SCORE <= score.score <= MAX_SCORE for score in scores):
+            raise ValueError(
+                f"Score should be between {MIN_SCORE} and {MAX_SCORE}."
+            )
+        rows = [
+            {"user_id": user_id, "word_id": score.word_id, "score": score.score, "lesson_id": lesson_id}
+            for score in scores
+        ]
+        with managed_session(self.Session) as session:
+            try:
+                for start in range(0, len(rows), SCORE_BATCH_SIZE):
+                    session.execute(
+                        insert(LearningDataDBObj).values(rows[start:start + SCORE_BATCH_SIZE])
+                    )
+            except IntegrityError as e:
                 logger.error(e)
                 raise ValueDoesNotExistInDB("User or word or lesson id invalid.") from e
 
     def get_score(self, user_id: int, word_id: int, lesson_id: int):
         with managed_session(self.Session) as session:
-                entry = session.execute(
-                    select(LearningDataDBObj).where(
-                        LearningDataDBObj.user_id == user_id,
-                        LearningDataDBObj.word_id == word_id,
-                        LearningDataDBObj.lesson_id == lesson_id,
+                # only the score column is needed; the unique (word_id, lesson_id) index
+                # finds the single row, which is then read from the table for its score
+                return session.execute(
+                    lambda_stmt(
+                        lambda: select(LearningDataDBObj.score).where(
+                            LearningDataDBObj.user_id == user_id,
+                            LearningDataDBObj.word_id == word_id,
+                            LearningDataDBObj.lesson_id == lesson_id,
+                        )
                     )
                 ).scalar()
-                return entry.score if entry else None
 
     def update_user_scores(self, user_id: int, lesson_scores: Set[Score], lesson_id: int) -> None:
         """
@@ -447,13 +885,11 @@ class DatabaseManager:
         """
         with managed_session(self.Session) as session:
             # Verify user exists
-            user = session.get(UserDBObj, user_id)
-            if not user:
+            if not self._user_exists(session, user_id):
                 raise ValueDoesNotExistInDB("User does not exist")
 
-            # Process each score
-            for score in lesson_scores:
-                self.add_word_score(user_id, score, lesson_id)
+            # one multi-row insert instead of a statement per score
+            self.bulk_add_word_scores(user_id, lesson_scores, lesson_id)
 
     def get_latest_word_score_for_user(self, user_id: int) -> Dict[int, UserScore]:
         """
@@ -469,33 +905,33 @@ class DatabaseManager:
         # TODO add more tests to check returning words
         with managed_session(self.Session) as session:
             # Check if user exists
-            user_exists = session.get(UserDBObj, user_id)
-            if not user_exists:
+            if not self._user_exists(session, user_id):
                 raise ValueDoesNotExistInDB("User does not exist.")
 
-            # Define a subquery to get the latest lesson_id for each word_id for the given user
-            subquery = session.query(
+            # Number the scores of each word from the latest lesson down in a single pass
+            ranked_scores = select(
                 LearningDataDBObj.word_id,
-                func.max(LearningDataDBObj.lesson_id).label('latest_lesson_id')
-            ).filter(
+                LearningDataDBObj.score,
+                LearningDataDBObj.lesson_id,
+                func.row_number().over(
+                    partition_by=LearningDataDBObj.word_id,
+                    order_by=LearningDataDBObj.lesson_id.desc(),
+                ).label("rank"),
+            ).where(
                 LearningDataDBObj.user_id == user_id
-            ).group_by(
-                LearningDataDBObj.word_id
             ).subquery()
 
-            # Join the LearningDataDBObj with the UserLessonDBObj to get the timestamps
-            latest_scores = session.query(
-                LearningDataDBObj.word_id,
-                LearningDataDBObj.score,
-                UserLessonDBObj.timestamp
-            ).join(
-                UserLessonDBObj,
-                LearningDataDBObj.lesson_id == UserLessonDBObj.id
-            ).join(
-                subquery,
-                and_(
-                    LearningDataDBObj.word_id == subquery.c.word_id,
-                    LearningDataDBObj.lesson_id == subquery.c.latest_lesson_id
+            # Keep the latest score of each word and join the lesson to get the timestamps
+            latest_scores = session.execute(
+                select(
+                    ranked_scores.c.word_id,
+                    ranked_scores.c.score,
+                    UserLessonDBObj.timestamp
+                ).join(
+                    UserLessonDBObj,
+                    ranked_scores.c.lesson_id == UserLessonDBObj.id
+                ).where(
+                    ranked_scores.c.rank == 1
                 )
             ).all()
 
@@ -513,12 +949,16 @@ class DatabaseManager:
         parameters = {
             param.name: param.description for param in template_obj.parameters
         }
+        examples = template_obj.examples
+        # templates added before examples were stored as a JSON list hold an encoded string
+        if isinstance(examples, str):
+            examples = json.loads(examples)
         template = TaskTemplate(
             target_language=template_obj.target_language,
             starting_language=template_obj.starting_language,
             template_string=template_obj.template,
             template_description=template_obj.description,
-            template_examples=json.loads(template_obj.examples),
+            template_examples=examples,
             parameter_description=parameters,
             task_type=template_obj.task_type,
             template_id=template_obj.id
@@ -535,24 +975,22 @@ class DatabaseManager:
                 task_type=template.task_type,
                 template=template.get_template_string(),
                 description=template.description,
-                examples=json.dumps(template.examples),
+                examples=template.examples,
                 starting_language=template.starting_language,
                 target_language=template.target_language,
             )
             session.add(template_obj)
-            for param_key in template.parameter_description:
-                param_obj = TemplateParameterDBObj(
-                    name=param_key,
-                    description=template.parameter_description[param_key],
-                )
-                template_obj.parameters.append(param_obj)
-                try:
-                    session.flush()
-                except (IntegrityError, Exception) as e:
-                    logger.error(e)
-                    session.rollback()
-                    raise ValueError("the following error occured: ", e) from e
-            session.commit()
+            template_obj.parameters.extend(
+                TemplateParameterDBObj(name=param_key, description=param_description)
+                for param_key, param_description in template.parameter_description.items()
+            )
+            # flush the template with all its parameters at once
+            try:
+                session.flush()
+            except (IntegrityError, Exception) as e:
+                logger.error(e)
+                session.rollback()
+                raise ValueError("the following error occured: ", e) from e
             return template_obj.id
 
     def remove_template(self, template_name: str) -> None:
@@ -573,15 +1011,11 @@ class DatabaseManager:
             Optional[TaskTemplate]: The retrieved template, or None if not found.
         """
         with managed_session(self.Session) as session:
-            stmt = select(TemplateDBObj).where(TemplateDBObj.id == template_id)
-            rows = session.scalars(stmt).all()
-            if len(rows) == 0:
-                return None
-            elif len(rows) == 1:
-                template_obj = rows[0]
-                return self.convert_template_obj(template_obj)
-            else:
-                raise KeyError(f"User id {template_id} is not unique.")
+            # session.get skips the query when the template is already in the identity map
+            template_obj = session.get(
+                TemplateDBObj, template_id, options=[selectinload(TemplateDBObj.parameters)]
+            )
+            return self.convert_template_obj(template_obj) if template_obj else None
             
     def get_template_parameters(self, template_id: int) -> Optional[Dict[str, str]]:
         """
@@ -644,19 +1078,22 @@ class DatabaseManager:
         with managed_session(self.Session) as session:
             resource_obj = ResourceDBObj(resource_text=resource_str)
 
-            for target_word in target_words:
-                try:
-                    word_obj = session.scalars(
-                        select(WordDBObj).where(WordDBObj.id == target_word.id)
-                    ).all()
-                except IntegrityError as e:
-                    raise ValueDoesNotExistInDB(e) from e
+            # load all target words at once
+            word_ids = {target_word.id for target_word in target_words}
+            words_by_id = {
+                word_obj.id: word_obj
+                for word_obj in session.scalars(
+                    select(WordDBObj).where(WordDBObj.id.in_(word_ids))
+                )
+            }
+            if missing_ids := word_ids - words_by_id.keys():
+                raise ValueDoesNotExistInDB(f"Words with ids {missing_ids} do not exist.")
+            for word_id in word_ids:
                 resource_word = ResourceWordDBObj()
-                resource_word.word = word_obj[0]
+                resource_word.word = words_by_id[word_id]
                 resource_obj.words.append(resource_word)
             session.add(resource_obj)
             session.flush()
-            session.commit()
 
             # create resource object
             resource = Resource(
@@ -693,25 +1130,24 @@ class DatabaseManager:
 
             # Delete the resource itself
             session.delete(resource_to_remove)
-            session.commit()
 
 
     def get_resource_by_id(self, resource_id: int) -> Optional[Resource]:
         with managed_session(self.Session) as session:
-            stmt = select(ResourceDBObj).where(ResourceDBObj.id == resource_id)
-            rows = session.scalars(stmt).all()
-            if len(rows) == 0:
+            resource_obj = session.get(
+                ResourceDBObj,
+                resource_id,
+                options=[selectinload(ResourceDBObj.words).joinedload(ResourceWordDBObj.word)],
+            )
+            if resource_obj is None:
                 return None
-            resources = []
-            for row in rows:
-                lexical_items = set()
-                for resource_word in row.words:
-                    word = resource_word.word
-                    lexical_items.add(
-                        LexicalItem(word.word, word.pos, word.freq, word.id)
-                    )
-                resource = Resource(row.id, row.resource_text, lexical_items)
-            return resource
+            lexical_items = set()
+            for resource_word in resource_obj.words:
+                word = resource_word.word
+                lexical_items.add(
+                    LexicalItem(word.word, word.pos, word.freq, word.id)
+                )
+            return Resource(resource_obj.id, resource_obj.resource_text, lexical_items)
 
     def get_resources_by_target_word(self, target_word: LexicalItem) -> List[Resource]:
         """
@@ -720,8 +1156,13 @@ class DatabaseManager:
             ValueDoesNotExistInDB error if target word is not in DB.
         """
         with managed_session(self.Session) as session:
-            stmt = select(ResourceDBObj).where(
-                ResourceDBObj.words.any(ResourceWordDBObj.word_id == target_word.id)
+            word_id = target_word.id
+            stmt = lambda_stmt(
+                lambda: select(ResourceDBObj).options(
+                    selectinload(ResourceDBObj.words).joinedload(ResourceWordDBObj.word)
+                ).where(
+                    ResourceDBObj.words.any(ResourceWordDBObj.word_id == word_id)
+                )
             )
             rows = session.scalars(stmt).all()
             resources = []
@@ -748,17 +1189,12 @@ class DatabaseManager:
             res.parameter.name: Resource(
                 resource_id=res.resource.id,
                 resource=res.resource.resource_text,
-                target_words=set(LexicalItem(word.word.word, word.word.pos, word.word.freq, word.word.id) for word in res.resource.words),
+                target_words=set(self._to_lexical_item(word.word) for word in res.resource.words),
             )
             for res in task_obj.resources
         }
         target_words = {
-            LexicalItem(
-                item=word.word.word,
-                pos=word.word.pos,
-                freq=word.word.freq,
-                id=word.word.id,
-            )
+            self._to_lexical_item(word.word)
             for word in task_obj.target_words
         }
 
@@ -798,21 +1234,28 @@ class DatabaseManager:
             for target_word in target_words:
                 task_target_word_obj = TaskTargetWordDBObj(word_id=target_word.id)
                 task_obj.target_words.append(task_target_word_obj)
+            # find all parameters of the template that the resources fill at once
+            parameters = {
+                parameter.name: parameter
+                for parameter in session.scalars(
+                    select(TemplateParameterDBObj).where(
+                        TemplateParameterDBObj.template_id == template_id,
+                        TemplateParameterDBObj.name.in_(list(resources.keys())),
+                    )
+                )
+            }
             # create task resoruces
             for param_name in resources:
+                if param_name not in parameters:
+                    raise ValueDoesNotExistInDB(
+                        f"Template {template_id} has no parameter {param_name}."
+                    )
                 task_resource_obj = TaskResourceDBObj(
                     resource_id=resources[param_name].resource_id,
                 )
-                # find parameter
-                stmt = select(TemplateParameterDBObj).where(
-                    TemplateParameterDBObj.template_id == template_id,
-                    TemplateParameterDBObj.name == param_name,
-                )
-                parameter = session.execute(stmt).scalar_one()
-                task_resource_obj.parameter = parameter
+                task_resource_obj.parameter = parameters[param_name]
                 task_obj.resources.append(task_resource_obj)
             session.flush()
-            session.commit()
  
             template = self.convert_template_obj(task_obj.template)
             # create task object
@@ -835,13 +1278,22 @@ class DatabaseManager:
         """
         with managed_session(self.Session) as session:
             if task_obj := session.scalars(
-                select(TaskDBObj).where(TaskDBObj.id == task_id)
-            ).first():
+                select(TaskDBObj).options(*TASK_LOADER_OPTIONS).where(TaskDBObj.id == task_id)
+            ).one_or_none():
                 return self.convert_task_obj_to_task(task_obj)
             else:
                 raise ValueDoesNotExistInDB(f"Task with ID {task_id} does not exist.")
 
 
+    def _get_tasks_by_ids(self, session: Session, task_ids: Set[int]) -> Dict[int, Task]:
+        """
+        Loads the tasks with task_ids in one query and returns them keyed by task id.
+        """
+        task_objs = session.scalars(
+            select(TaskDBObj).options(*TASK_LOADER_OPTIONS).where(TaskDBObj.id.in_(task_ids))
+        ).all()
+        return {task_obj.id: self.convert_task_obj_to_task(task_obj) for task_obj in task_objs}
+
     def get_tasks_by_type(self, task_type: TaskType, number: int = 100) -> List[Task]:
         """
         Return task of the task_type. Returns at most 100 tasks unless otherwise specified.
@@ -854,6 +1306,7 @@ class DatabaseManager:
             # Query for tasks with the specified task type using a JOIN with the Template table
             tasks_query = (
                 select(TaskDBObj)
+                .options(*TASK_LOADER_OPTIONS)
                 .join(TemplateDBObj, TaskDBObj.template)
                 .where(TemplateDBObj.task_type == task_type.name)
                 .limit(number)
@@ -879,6 +1332,7 @@ class DatabaseManager:
             # Query for tasks associated with the specified template ID
             tasks_query = (
                 select(TaskDBObj)
+                .options(*TASK_LOADER_OPTIONS)
                 .where(TaskDBObj.template_id == template_id)
                 .limit(number)
             )
@@ -905,23 +1359,22 @@ class DatabaseManager:
             # Extract IDs from LexicalItem set for comparison
             target_word_ids = {word.id for word in target_words}
 
-            # Construct a subquery to filter tasks based on word presence
+            # Ids of tasks that target every requested word; passed to IN()
+            # as a plain select so the database sees a single IN (SELECT ...)
             task_ids_with_all_words = (
-                select(TaskDBObj.id)
-                .join(TaskTargetWordDBObj, TaskDBObj.target_words)
-                .filter(TaskTargetWordDBObj.word_id.in_(target_word_ids))
-                .group_by(TaskDBObj.id)
-                .having(func.count(TaskDBObj.id) == len(target_word_ids))
+                select(TaskTargetWordDBObj.task_id)
+                .where(TaskTargetWordDBObj.word_id.in_(target_word_ids))
+                .group_by(TaskTargetWordDBObj.task_id)
+                .having(
+                    func.count(func.distinct(TaskTargetWordDBObj.word_id))
+                    == len(target_word_ids)
+                )
             )
 
-            # Create a subquery for use in the main query
-            task_ids_subquery = task_ids_with_all_words.subquery()
-
-            # NOTE SAWarning: Coercing Subquery object into a select() for use in IN(); please pass a select() construct explicitly
-            # Now query for tasks where task IDs are in the above subquery results
             tasks_query = (
                 select(TaskDBObj)
-                .where(TaskDBObj.id.in_(select(task_ids_subquery)))
+                .options(*TASK_LOADER_OPTIONS)
+                .where(TaskDBObj.id.in_(task_ids_with_all_words))
                 .limit(number)
             )
 
@@ -939,7 +1392,7 @@ class DatabaseManager:
     def get_tasks_by_criteria(self, user_id: int, criteria: QueryCriteria, limit: int = 50) -> list[Task]:
         with managed_session(self.Session) as session:
             task_query = QueryBuilder().build_query(user_id, criteria)
-            task_query = task_query.limit(limit)
+            task_query = task_query.options(*TASK_LOADER_OPTIONS).limit(limit)
             tasks = session.execute(task_query).scalars().all()
 
             # Convert TaskDBObj to Task instances
@@ -973,7 +1426,6 @@ class DatabaseManager:
 
             # Delete the task itself
             session.delete(task_to_remove)
-            session.commit()
 
 
     """
@@ -1007,6 +1459,24 @@ class DatabaseManager:
         }
 
 
+    @staticmethod
+    def _get_first_uncompleted_lesson_plan_task(
+        session: Session, lesson_plan_id: int
+    ) -> Optional[LessonPlanTaskDBObj]:
+        """
+        Return the uncompleted lesson plan task with the lowest
+        (sequence_num, attempt_num) in the lesson plan, or None if all are completed.
+        """
+        return session.scalars(
+            select(LessonPlanTaskDBObj)
+            .where(
+                LessonPlanTaskDBObj.lesson_plan_id == lesson_plan_id,
+                LessonPlanTaskDBObj.completed == False
+            )
+            .order_by(LessonPlanTaskDBObj.sequence_num, LessonPlanTaskDBObj.attempt_num)
+            .limit(1)
+        ).first()
+
     def retrieve_lesson(self, user_id: int) -> Optional[LessonHead]:
         """
         Retrieves the lesson ID and the first uncompleted task for a lesson.
@@ -1045,15 +1515,9 @@ class DatabaseManager:
             latest_lesson = lessons[0]
             logger.info(f"The latest uncompleted lesson with ID {latest_lesson.id} was found.")
 
-            first_non_completed_task = None
-            # Retrieve the first uncompleted task in the lesson plan
-            # use sorted tasks by (sequence_num, attempt) increasing
-            # to get first uncompleted task
-            sorted_tasks = sorted(latest_lesson.lesson_plan.tasks, key=lambda task: (task.sequence_num, task.attempt_num))
-            for task in sorted_tasks:
-                if not task.completed:
-                    first_non_completed_task = task
-                    break
+            first_non_completed_task = self._get_first_uncompleted_lesson_plan_task(
+                session, latest_lesson.lesson_plan.id
+            )
 
             if not first_non_completed_task:
                 raise Exception("New lesson contains zero tasks or sequence numbering is incorrect.")
@@ -1107,57 +1571,50 @@ class DatabaseManager:
         """
         with managed_session(self.Session) as session:
             # Check if user exists
-            user = session.get(UserDBObj, user_id)
-            if not user:
+            if not self._user_exists(session, user_id):
                 raise ValueDoesNotExistInDB("User does not exist")
 
             if lesson_head := self.retrieve_lesson(user_id):
                 return lesson_head
 
-            # Create a new lesson
-            new_lesson = UserLessonDBObj(user_id=user_id, completed=False)
+            # Create a new lesson with its plan; the plan is linked through the
+            # relationship, so a single flush assigns both ids
+            new_lesson = UserLessonDBObj(
+                user_id=user_id, completed=False, lesson_plan=LessonPlanDBObj()
+            )
             session.add(new_lesson)
-            session.flush()  # To obtain the lesson_id
-            new_lesson.lesson_plan = LessonPlanDBObj(lesson_id=new_lesson.id)
-            session.flush()
+            session.flush()  # To obtain the lesson plan id
             # TODO where to check that the plan is empty?
-            # Process each task and its correction strategies
+            # Process each task and its correction strategies into rows
+            # for a single executemany insert
+            lesson_plan_id = new_lesson.lesson_plan.id
+            rows = []
             for index, (task, corrections) in enumerate(lesson_plan):
-                lesson_plan_task = LessonPlanTaskDBObj(
-                        lesson_plan_id=new_lesson.lesson_plan.id,
-                        sequence_num=index,
-                        attempt_num=0,
-                        task_id=task.id,
-                        completed=False,
-                        error_correction=CorrectionStrategy.NoStrategy
-                    )
-                session.add(lesson_plan_task)
-                new_lesson.lesson_plan.tasks.append(lesson_plan_task)
+                rows.append({
+                    "lesson_plan_id": lesson_plan_id,
+                    "sequence_num": index,
+                    "attempt_num": 0,
+                    "task_id": task.id,
+                    "completed": False,
+                    "error_correction": CorrectionStrategy.NoStrategy
+                })
                 for attempt, correction in enumerate(corrections, start=1):
                     if isinstance(correction, Task):
-                        lesson_plan_task = LessonPlanTaskDBObj(
-                                lesson_plan_id=new_lesson.lesson_plan.id,
-                                sequence_num=index,
-                                attempt_num=attempt,
-                                task_id=correction.id,
-                                completed=False,
-                                error_correction=None
-                            )
+                        task_id, error_correction = correction.id, None
                     elif isinstance(correction, CorrectionStrategy):
-                        lesson_plan_task = LessonPlanTaskDBObj(
-                                lesson_plan_id=new_lesson.lesson_plan.id,
-                                sequence_num=index,
-                                attempt_num=attempt,
-                                task_id=None,
-                                completed=False,
-                                error_correction=correction
-                            )
+                        task_id, error_correction = None, correction
                     else:
                         raise Exception("Unknown type for correction object.")
-                    session.add(lesson_plan_task)
-                    new_lesson.lesson_plan.tasks.append(lesson_plan_task)
-                    session.flush()
-            session.commit()
+                    rows.append({
+                        "lesson_plan_id": lesson_plan_id,
+                        "sequence_num": index,
+                        "attempt_num": attempt,
+                        "task_id": task_id,
+                        "completed": False,
+                        "error_correction": error_correction
+                    })
+            if rows:
+                session.execute(insert(LessonPlanTaskDBObj), rows)
 
             # Return the first task and lesson_id
             return {
@@ -1232,8 +1689,7 @@ class DatabaseManager:
                 .where(
                     LessonPlanTaskDBObj.lesson_plan_id == lesson.lesson_plan.id,
                     LessonPlanTaskDBObj.sequence_num == order.sequence_num,
-                    LessonPlanTaskDBObj.attempt_num == order.attempt,
-                    LessonPlanTaskDBObj.task_id == TaskDBObj.id
+                    LessonPlanTaskDBObj.attempt_num == order.attempt
                 )
             )
             lesson_task_obj = session.execute(lesson_task_stmt).scalar_one_or_none()
@@ -1276,11 +1732,9 @@ class DatabaseManager:
                     score=score.score
                 )
                 new_history_entry.scores.append(new_score)
-            
-            session.flush()
+
             # Mark the task as completed
             lesson_task_obj.completed = True
-            session.commit()
 
     def get_evaluation_for_task(
             self,
@@ -1306,7 +1760,9 @@ class DatabaseManager:
 
             # Directly retrieve the specific evaluation
             evaluation_obj = session.execute(
-                select(EvaluationDBObj).options(selectinload(EvaluationDBObj.history_entries))
+                select(EvaluationDBObj).options(
+                    selectinload(EvaluationDBObj.history_entries).selectinload(HistoryEntrieDBObj.scores)
+                )
                 .where(
                     EvaluationDBObj.lesson_id == lesson_id,
                     EvaluationDBObj.sequence_number == order.sequence_num
@@ -1317,9 +1773,12 @@ class DatabaseManager:
                 return None  # No evaluation yet for the task
 
             # Convert to the Evaluation domain model
+            tasks = self._get_tasks_by_ids(
+                session, {h_entry_obj.task_id for h_entry_obj in evaluation_obj.history_entries}
+            )
             evaluation = Evaluation()
             for h_entry_obj in evaluation_obj.history_entries:
-                task = self.get_task_by_id(h_entry_obj.task_id)
+                task = tasks[h_entry_obj.task_id]
                 scores = {Score(score_obj.word_id, score_obj.score) for score_obj in h_entry_obj.scores}
                 evaluation.add_entry(task, h_entry_obj.response, scores)
             return evaluation
@@ -1342,55 +1801,53 @@ class DatabaseManager:
             NongeneratedNextTask
             None if there are no more tasks in the lesson to be completed.
         """
-        # NOTE ERROR:database_orm:Couldn't get next task for lesson: The unique() method must be invoked on this Result, as it contains results that include joined eager loads against collections
         with managed_session(self.Session) as session:
-            # Fetch lesson plan and its tasks
-            # NOTE using options in order to specify which kind of load we want
-            # using joinedload as the particular lesson with tasks is small enough dataset.
+            # Fetch the lesson and its plan; the plan tasks are not loaded,
+            # only the first uncompleted one is queried below
             stmt = select(UserLessonDBObj).options(
-                joinedload(UserLessonDBObj.lesson_plan).joinedload(LessonPlanDBObj.tasks)
+                joinedload(UserLessonDBObj.lesson_plan)
             ).where(
                 UserLessonDBObj.id == lesson_id,
                 UserLessonDBObj.user_id == user_id
             )
-            lesson = session.execute(stmt).unique().scalar_one_or_none()
+            lesson = session.execute(stmt).scalar_one_or_none()
 
             if not lesson:
                 raise ValueError("Lesson not found for the given user and lesson ID.")
 
-            # Filter to find the first uncompleted task
-            for task_obj in sorted(lesson.lesson_plan.tasks, key=lambda x: (x.sequence_num, x.attempt_num)):
-                if not task_obj.completed:
-                    # Check if it needs correction handling
-                    # TODO make it clearer when error correction is defined in the table and not
-                    # NOTE only error correction task is not defined in the database, so it must have an eval
-                    if task_obj.error_correction and task_obj.error_correction != CorrectionStrategy.NoStrategy:
-                        if evaluation := self.get_evaluation_for_task(
-                            user_id,
-                            lesson_id,
-                            Order(task_obj.sequence_num, task_obj.attempt_num),
-                        ):
-                            return {
-                                "order": Order(task_obj.sequence_num, task_obj.attempt_num),
-                                "task": None,
-                                "eval": evaluation,
-                                "error_correction": task_obj.error_correction
-                            }
-
-                        else:
-                            raise ValueDoesNotExistInDB("Evaluation for nongenerated error correction task is missing.")
-                    # Retrieve the Task associated with this lesson plan task
-                    task = self.get_task_by_id(task_obj.task_id)
-                    return {
-                        "order": Order(task_obj.sequence_num, task_obj.attempt_num),
-                        "task": task,
-                        "eval": None,
-                        "error_correction": None
-                    }
+            task_obj = self._get_first_uncompleted_lesson_plan_task(
+                session, lesson.lesson_plan.id
+            )
+            if task_obj:
+                # Check if it needs correction handling
+                # TODO make it clearer when error correction is defined in the table and not
+                # NOTE only error correction task is not defined in the database, so it must have an eval
+                if task_obj.error_correction and task_obj.error_correction != CorrectionStrategy.NoStrategy:
+                    if evaluation := self.get_evaluation_for_task(
+                        user_id,
+                        lesson_id,
+                        Order(task_obj.sequence_num, task_obj.attempt_num),
+                    ):
+                        return {
+                            "order": Order(task_obj.sequence_num, task_obj.attempt_num),
+                            "task": None,
+                            "eval": evaluation,
+                            "error_correction": task_obj.error_correction
+                        }
+
+                    else:
+                        raise ValueDoesNotExistInDB("Evaluation for nongenerated error correction task is missing.")
+                # Retrieve the Task associated with this lesson plan task
+                task = self.get_task_by_id(task_obj.task_id)
+                return {
+                    "order": Order(task_obj.sequence_num, task_obj.attempt_num),
+                    "task": task,
+                    "eval": None,
+                    "error_correction": None
+                }
 
             # If no uncompleted tasks are found, mark the lesson as completed
             lesson.completed = True
-            session.commit()
             return None  # Indicate that there are no more tasks
 
     def update_lesson_plan_with_task(
@@ -1411,7 +1868,7 @@ class DatabaseManager:
             # Ensure the user and lesson exist and retrieve the lesson plan
             lesson = session.execute(
                 select(UserLessonDBObj)
-                .options(joinedload(UserLessonDBObj.lesson_plan).joinedload(LessonPlanDBObj.tasks))
+                .options(joinedload(UserLessonDBObj.lesson_plan))
                 .where(UserLessonDBObj.id == lesson_id, UserLessonDBObj.user_id == user_id)
             ).scalar_one_or_none()
 
@@ -1419,11 +1876,13 @@ class DatabaseManager:
                 raise ValueError("Lesson or user does not exist.")
 
             # Locate the task within the lesson plan
-            task_obj = None
-            for t in lesson.lesson_plan.tasks:
-                if t.sequence_num == order.sequence_num and t.attempt_num == order.attempt:
-                    task_obj = t
-                    break
+            task_obj = session.execute(
+                select(LessonPlanTaskDBObj).where(
+                    LessonPlanTaskDBObj.lesson_plan_id == lesson.lesson_plan.id,
+                    LessonPlanTaskDBObj.sequence_num == order.sequence_num,
+                    LessonPlanTaskDBObj.attempt_num == order.attempt
+                )
+            ).scalar_one_or_none()
             
             if not task_obj:
                 raise Exception("Specified task order not found in the lesson plan.")
@@ -1438,7 +1897,6 @@ class DatabaseManager:
             # Update the task in the lesson plan
             task_obj.task_id = task.id
             task_obj.completed = False
-            session.commit()
     
     def save_user_lesson_data(
         self, user_id: int, lesson_data: List[Evaluation]
@@ -1451,7 +1909,7 @@ class DatabaseManager:
         Returns lesson id.
         """
         with managed_session(self.Session) as session:
-            if not session.get(UserDBObj, user_id):
+            if not self._user_exists(session, user_id):
                 raise ValueDoesNotExistInDB("User does not exist.")
 
             # Create a new user lesson
@@ -1478,7 +1936,6 @@ class DatabaseManager:
                 new_lesson.evaluations.append(new_evaluation)
             session.add(new_lesson)
             session.flush()
-            session.commit()
             lesson_id = new_lesson.id
             return lesson_id
 
@@ -1490,12 +1947,17 @@ class DatabaseManager:
         """
         with managed_session(self.Session) as session:
             # TODO what about correction field?
-            if not session.get(UserDBObj, user_id):
+            if not self._user_exists(session, user_id):
                 raise ValueDoesNotExistInDB("User does not exist.")
 
             # Get the most recent lesson
             recent_lesson_query = (
                 select(UserLessonDBObj)
+                .options(
+                    selectinload(UserLessonDBObj.evaluations)
+                    .selectinload(EvaluationDBObj.history_entries)
+                    .selectinload(HistoryEntrieDBObj.scores)
+                )
                 .where(UserLessonDBObj.user_id == user_id)
                 .order_by(UserLessonDBObj.timestamp.desc())
                 .limit(1)
@@ -1507,6 +1969,11 @@ class DatabaseManager:
             if not recent_lesson:
                 return None
 
+            tasks = self._get_tasks_by_ids(session, {
+                entry.task_id
+                for evaluation_obj in recent_lesson.evaluations
+                for entry in evaluation_obj.history_entries
+            })
             evaluations = []
             # TODO need to do it in index order
             for evaluation_obj in recent_lesson.evaluations:
@@ -1516,7 +1983,7 @@ class DatabaseManager:
                         Score(word_id=score.word_id, score=score.score)
                         for score in entry.scores
                     }
-                    task = self.get_task_by_id(entry.task_id)
+                    task = tasks[entry.task_id]
                     history_entries.append(
                         HistoryEntry(
                             task=task, response=entry.response, evaluation_result=scores
@@ -1561,9 +2028,9 @@ class DatabaseManager:
 
             # Mark the lesson as completed
             lesson.completed = True
-            session.commit()
 
-            # Retrieve all evaluations for the lesson
+            # Retrieve all evaluations for the lesson; the query below
+            # autoflushes the completed flag before reading
             evaluations = self.get_most_recent_lesson_data(user_id)
             if not evaluations:
                 raise ValueDoesNotExistInDB("No completed lesson was found for the user.")
@@ -1613,25 +2080,24 @@ class DatabaseManager:
         """
         with managed_session(self.Session) as session:
             # Check if the user exists
-            if not session.get(UserDBObj, user_id):
+            if not self._user_exists(session, user_id):
                 raise ValueDoesNotExistInDB(f"User with ID {user_id} does not exist.")
 
             # Get IDs of words that the user has already scored
             user_scores = self.get_latest_word_score_for_user(user_id)
 
             # Retrieve words that are not scored by the user and match the POS criteria
-            eligible_words_query = select(WordDBObj).where(
+            eligible_words_query = select(
+                WordDBObj.word, WordDBObj.pos, WordDBObj.freq, WordDBObj.id
+            ).where(
                 and_(
                     WordDBObj.id.notin_(list(user_scores.keys())),
                     WordDBObj.pos.in_(['NOUN', 'ADJ', 'VERB'])
                 )
             ).order_by(WordDBObj.freq.desc()).limit(word_num)
 
-            # Execute the query
-            eligible_words = session.scalars(eligible_words_query).all()
+            # Execute the query, selecting plain columns as LexicalItem does not need ORM objects
+            eligible_words = session.execute(eligible_words_query).all()
 
-            # Convert WordDBObj to LexicalItem and return
-            return {
-                LexicalItem(item=word_obj.word, pos=word_obj.pos, freq=word_obj.freq, id=word_obj.id)
-                for word_obj in eligible_words
-            }
+            # Convert rows to LexicalItem and return
+            return {LexicalItem(*row) for row in eligible_words}
@@ -1,13 +1,19 @@
-from contextlib import contextmanager
+from contextlib import closing, contextmanager
+import gc
+import json
+import sqlite3
+import threading
 from typing import Set
 import unittest
+from unittest.mock import patch
 
-from sqlalchemy import select
+from sqlalchemy import delete, select, text
 from app_factory import create_app
 from data_structures import (
     MAX_SCORE,
     MAX_USER_NAME_LENGTH,
     MIN_SCORE,
+    CorrectionStrategy,
     Language,
     LexicalItem,
     Score,
@@ -15,28 +21,37 @@ from data_structures import (
 )
 
 from database_orm import (
+    WORD_BATCH_SIZE,
     DatabaseManager,
     InvalidDelete,
+    Order,
     ValueDoesNotExistInDB,
+    get_db_engine,
+    managed_session,
+    read_word_chunks_from_file,
 )
 from database_objects import (
+    EvaluationDBObj,
     LearningDataDBObj,
+    LessonPlanTaskDBObj,
     ResourceDBObj,
     ResourceWordDBObj,
     TaskDBObj,
     TaskResourceDBObj,
     TaskTargetWordDBObj,
+    TemplateDBObj,
     UserLessonDBObj,
     WordDBObj,
 )
 import os
 
 from task import Task, get_task_type_class
-from evaluation import Evaluation
+from evaluation import Evaluation, HistoryEntry
 from task_template import TaskTemplate
 
 # Define a test database file path
 TEST_DB_FILE = "test_database.db"
+TEST_WORD_FILE = "test_words.txt"
 
 class TestMixin:
     def setUp(self):
@@ -91,6 +106,41 @@ class TestDatabaseFunctions(TestMixin, unittest.TestCase):
         user = self.db_manager.get_user_by_id(self.user_id)
         self.assertIsNone(user)  # Check that no row is returned
 
+    def test_remove_user_with_lesson_data(self):
+        word = self.db_manager.get_word_by_id(self.word_ids[0])
+        with session_manager(self.db_manager):
+            template_id = add_template(self.db_manager)
+            task = create_example_task(self.db_manager, "blah", "blah", {word}, template_id)
+            evaluation = Evaluation()
+            evaluation.add_entry(task, "response1", {Score(word.id, 8)})
+            lesson_id = self.db_manager.save_user_lesson_data(self.user_id, [evaluation])
+            self.db_manager.update_user_scores(self.user_id, {Score(word.id, 8)}, lesson_id)
+
+        self.db_manager.remove_user(self.user_id)
+
+        self.assertIsNone(self.db_manager.get_user_by_id(self.user_id))
+        # the scores and lessons of the user are removed with the user
+        with self.db_manager.Session() as session:
+            self.assertEqual(session.scalars(select(LearningDataDBObj)).all(), [])
+            self.assertEqual(session.scalars(select(UserLessonDBObj)).all(), [])
+            self.assertEqual(session.scalars(select(EvaluationDBObj)).all(), [])
+
+    def test_remove_user_drops_loaded_lessons(self):
+        word = self.db_manager.get_word_by_id(self.word_ids[0])
+        template_id = add_template(self.db_manager)
+        task = create_example_task(self.db_manager, "blah", "blah", {word}, template_id)
+        evaluation = Evaluation()
+        evaluation.add_entry(task, "response1", {Score(word.id, 8)})
+        lesson_id = self.db_manager.save_user_lesson_data(self.user_id, [evaluation])
+        # the lesson is loaded and held in the session before the user is removed
+        session = self.db_manager.Session()
+        lesson = session.get(UserLessonDBObj, lesson_id)
+        self.assertIsNotNone(lesson)
+
+        self.db_manager.remove_user(self.user_id)
+
+        self.assertIsNone(session.get(UserLessonDBObj, lesson_id))
+
     def test_remove_nonexistent_user(self):
         # Test removing a non-existent user
         with self.assertRaises(ValueDoesNotExistInDB):
@@ -115,6 +165,49 @@ class TestDatabaseFunctions(TestMixin, unittest.TestCase):
                 long_username
             )  # Inserting a long user name should raise a ValueError
 
+    def test_transaction_commits_all_calls(self):
+        # Test that calls grouped in a transaction are all saved
+        with session_manager(self.db_manager):
+            with self.db_manager.transaction():
+                first_user_id = self.db_manager.insert_user("first_user")
+                word_ids = self.db_manager.add_words_to_db([("cat", "NOUN", 10)])
+
+        self.assertEqual(self.db_manager.get_user_by_id(first_user_id).user_name, "first_user")
+        self.assertEqual(self.db_manager.get_word_by_id(word_ids[0]).item, "cat")
+
+    def test_transaction_rolls_back_all_calls_on_error(self):
+        # Test that an error inside a transaction discards the earlier calls as well
+        with session_manager(self.db_manager):
+            with self.assertRaises(ValueError):
+                with self.db_manager.transaction():
+                    first_user_id = self.db_manager.insert_user("first_user")
+                    self.db_manager.insert_user("test_user")  # duplicate user name
+
+        self.assertIsNone(self.db_manager.get_user_by_id(first_user_id))
+
+    def test_transaction_rolls_back_on_interrupt(self):
+        # Test that a KeyboardInterrupt inside a transaction rolls it back
+        # before the session is used again
+        with session_manager(self.db_manager):
+            with self.assertRaises(KeyboardInterrupt):
+                with self.db_manager.transaction():
+                    first_user_id = self.db_manager.insert_user("first_user")
+                    raise KeyboardInterrupt
+            self.assertIsNone(self.db_manager.get_user_by_id(first_user_id))
+
+    def test_transaction_rolls_back_template_and_resource(self):
+        # Test that methods which used to commit on their own wait for the transaction
+        word = self.db_manager.get_word_by_id(self.word_ids[0])
+        with session_manager(self.db_manager):
+            with self.assertRaises(ValueError):
+                with self.db_manager.transaction():
+                    template_id = add_template(self.db_manager)
+                    resource = self.db_manager.add_resource_manual("resource", {word})
+                    self.db_manager.insert_user("test_user")  # duplicate user name
+
+        self.assertIsNone(self.db_manager.get_template_by_id(template_id))
+        self.assertIsNone(self.db_manager.get_resource_by_id(resource.resource_id))
+
     def test_add_two_word_entries(self):
         # Test adding two word entries to the words table successfully
         test_words = {"cat": ("cat", "NOUN", 10), "dog": ("dog", "NOUN", 5)}
@@ -170,6 +263,118 @@ class TestDatabaseFunctions(TestMixin, unittest.TestCase):
             ).all()  # TODO remove sqlalchemy code
             self.assertEqual(len(all_words), len(self.word_ids))  # Ensure only one word entry exists
 
+    def test_add_word_entries_over_several_batches(self):
+        # Test adding more words than fit into one bulk insert statement
+        word_list = [(f"word{i}", "NOUN", i) for i in range(2 * WORD_BATCH_SIZE + 1)]
+        with session_manager(self.db_manager):
+            word_ids = self.db_manager.add_words_to_db(word_list)
+
+        self.assertEqual(len(set(word_ids)), len(word_list))
+        word = self.db_manager.get_word_by_id(word_ids[-1])
+        self.assertEqual((word.item, word.pos, word.freq), word_list[-1])
+
+    def test_update_word_entry_loaded_in_session(self):
+        # Test that a word already loaded in the session reflects an updated frequency
+        word = self.db_manager.get_word_by_id(self.word_ids[0])
+        with self.db_manager.Session() as session:
+            word_obj = session.get(WordDBObj, word.id)  # keep the object in the identity map
+            self.db_manager.add_words_to_db([(word.item, word.pos, word.freq + 10)])
+            self.assertEqual(self.db_manager.get_word_by_id(word.id).freq, word.freq + 10)
+            self.assertEqual(word_obj.freq, word.freq + 10)
+
+    def test_get_word_by_id_is_cached(self):
+        # Test that a repeated read of a word is served from the word cache
+        word = self.db_manager.get_word_by_id(self.word_ids[0])
+        self.assertIs(self.db_manager.get_word_by_id(self.word_ids[0]), word)
+
+    def test_word_loaded_in_earlier_transaction_is_not_cached(self):
+        # Test that a word object loaded before another thread updated the word
+        # does not put its old freq into the cache in a later transaction
+        template_id = add_template(self.db_manager)
+        task = create_example_task(
+            self.db_manager, "r1", "r2", {self.db_manager.get_word_by_id(self.word_ids[0])}, template_id
+        )
+        self.db_manager.shutdown_session()
+        session = self.db_manager.Session()
+        word_obj = session.get(WordDBObj, self.word_ids[0])
+        session.commit()
+
+        def update_word():
+            self.db_manager.add_words_to_db([("apple", "NOUN", 99)])
+            self.db_manager.shutdown_session()
+        writer = threading.Thread(target=update_word)
+        writer.start()
+        writer.join()
+
+        # the task's target word is the object loaded before the update
+        self.db_manager.get_task_by_id(task.id)
+        self.assertEqual(word_obj.freq, 50)
+        self.assertEqual(self.db_manager.get_word_by_id(self.word_ids[0]).freq, 99)
+
+    def test_add_word_batch_with_mappings(self):
+        # Test the word insert path of databases without ON CONFLICT support
+        word_batch = [("apple", "NOUN", 70), ("cat", "NOUN", 10), ("dog", "NOUN", 5)]
+        with session_manager(self.db_manager):
+            with managed_session(self.db_manager.Session) as session:
+                word_ids = self.db_manager._add_word_batch_with_mappings(session, word_batch)
+
+        self.assertEqual(set(word_ids), {("apple", "NOUN"), ("cat", "NOUN"), ("dog", "NOUN")})
+        # the existing word keeps its id and gets the new freq
+        self.assertEqual(word_ids[("apple", "NOUN")], self.word_ids[0])
+        self.assertEqual(self.db_manager.get_word_by_id(self.word_ids[0]).freq, 70)
+        # the new words are inserted under the returned ids
+        for word, pos, freq in word_batch[1:]:
+            self.assertEqual(
+                self.db_manager.get_word_by_id(word_ids[(word, pos)]),
+                LexicalItem(word, pos, freq, word_ids[(word, pos)])
+            )
+        with self.db_manager.Session() as session:
+            self.assertEqual(len(session.scalars(select(WordDBObj)).all()), len(self.words_tuples) + 2)
+
+    def test_add_words_without_upsert_returning_uses_mappings(self):
+        # Test that dialects which can not return ids from an upsert take the mappings path
+        dialect = self.db_manager.Session.get_bind().dialect
+        add_with_mappings = self.db_manager._add_word_batch_with_mappings
+        with patch.object(dialect, "insert_executemany_returning", False), patch.object(
+            self.db_manager, "_add_word_batch_with_mappings", wraps=add_with_mappings
+        ) as fallback:
+            with session_manager(self.db_manager):
+                word_ids = self.db_manager.add_words_to_db([("apple", "NOUN", 70), ("cat", "NOUN", 10)])
+
+        fallback.assert_called_once()
+        self.assertEqual(word_ids[0], self.word_ids[0])
+        self.assertEqual(self.db_manager.get_word_by_id(word_ids[0]).freq, 70)
+        self.assertEqual(self.db_manager.get_word_by_id(word_ids[1]).item, "cat")
+
+    def test_word_read_before_concurrent_update_is_not_cached(self):
+        # Test that a read in a transaction begun before another thread committed
+        # an update of the word does not put the word into the cache
+        self.db_manager.Session().execute(select(WordDBObj.id).limit(1))
+
+        def update_word():
+            self.db_manager.add_words_to_db([("apple", "NOUN", 99)])
+            self.db_manager.shutdown_session()
+        writer = threading.Thread(target=update_word)
+        writer.start()
+        writer.join()
+
+        word = self.db_manager.get_word_by_id(self.word_ids[0])
+        reread_word = self.db_manager.get_word_by_id(self.word_ids[0])
+        self.assertIsNot(reread_word, word)
+        self.assertEqual(reread_word.freq, 99)
+        self.assertIs(self.db_manager.get_word_by_id(self.word_ids[0]), reread_word)
+
+    def test_add_duplicate_word_entries_in_one_list(self):
+        # Test adding the same word/pos twice in one call keeps one row with the highest freq
+        word_list = [("cat", "NOUN", 10), ("dog", "NOUN", 5), ("cat", "NOUN", 15)]
+        with session_manager(self.db_manager):
+            word_ids = self.db_manager.add_words_to_db(word_list)
+
+        self.assertEqual(len(word_ids), len(word_list))  # one id per input tuple
+        self.assertEqual(word_ids[0], word_ids[2])  # both cat entries map to the same row
+        word = self.db_manager.get_word_by_id(word_ids[0])
+        self.assertEqual(word.freq, 15)
+
     def test_add_word_score(self):
         word = self.db_manager.get_word_by_id(self.word_ids[0])
         score_value = 8
@@ -408,6 +613,46 @@ class TestUpdateUserScores(TestMixin, unittest.TestCase):
             # Add old score
             self.db_manager.update_user_scores(self.user_id, {Score(word.id, OLD_SCORE), Score(word.id, NEW_SCORE)}, lesson_id)
 
+    def test_bulk_add_word_scores(self):
+        words = [self.db_manager.get_word_by_id(word_id) for word_id in self.word_ids[:3]]
+
+        with session_manager(self.db_manager):
+            template_id = add_template(self.db_manager)
+
+        with session_manager(self.db_manager):
+            task = create_example_task(self.db_manager, "blah", "blah", set(words), template_id)
+            evaluation1 = Evaluation()
+            evaluation1.add_entry(task, "response1", {Score(word.id, 5) for word in words})
+            lesson_id = self.db_manager.save_user_lesson_data(self.user_id, [evaluation1])
+
+        scores = {Score(word.id, index + 3) for index, word in enumerate(words)}
+        self.db_manager.bulk_add_word_scores(self.user_id, scores, lesson_id)
+
+        for score in scores:
+            self.assertEqual(self.db_manager.get_score(self.user_id, score.word_id, lesson_id), score.score)
+
+    def test_bulk_add_word_scores_invalid_score(self):
+        word = self.db_manager.get_word_by_id(self.word_ids[0])
+        with self.assertRaises(ValueError):
+            self.db_manager.bulk_add_word_scores(self.user_id, {Score(word.id, MAX_SCORE + 1)}, 1)
+
+    def test_bulk_add_word_scores_two_scores_for_word_same_lesson(self):
+        word = self.db_manager.get_word_by_id(self.word_ids[0])
+
+        with session_manager(self.db_manager):
+            template_id = add_template(self.db_manager)
+
+        with session_manager(self.db_manager):
+            task = create_example_task(self.db_manager, "blah", "blah", {word}, template_id)
+            evaluation1 = Evaluation()
+            evaluation1.add_entry(task, "response1", {Score(word.id, 8)})
+            lesson_id = self.db_manager.save_user_lesson_data(self.user_id, [evaluation1])
+
+        with self.assertRaises(ValueDoesNotExistInDB):
+            self.db_manager.bulk_add_word_scores(self.user_id, {Score(word.id, 8), Score(word.id, 5)}, lesson_id)
+        # nothing from the failed call is kept
+        self.assertIsNone(self.db_manager.get_score(self.user_id, word.id, lesson_id))
+
     def test_update_user_scores_nonexistent_word(self):
         word = self.db_manager.get_word_by_id(self.word_ids[0])
         score_value = 8
@@ -561,6 +806,22 @@ class TestTemplates(TestMixin, unittest.TestCase):
         )
         self.assertEqual(retrieved_template.task_type, self.template.task_type)
 
+    def test_get_template_with_legacy_string_examples(self):
+        # Test that templates saved when examples were stored as an encoded
+        # JSON string still come back as a list
+        with session_manager(self.db_manager):
+            template_id = self.db_manager.add_template(self.template)
+        with self.db_manager.Session() as session:
+            session.execute(
+                text("UPDATE templates SET examples = :examples WHERE id = :id"),
+                {"examples": json.dumps(json.dumps(self.template_examples)), "id": template_id},
+            )
+            session.commit()
+            self.assertIsInstance(session.get(TemplateDBObj, template_id).examples, str)
+
+        retrieved_template = self.db_manager.get_template_by_id(template_id)
+        self.assertEqual(retrieved_template.examples, self.template_examples)
+
     def test_add_template_duplicate_template_string(self):
         template_2 = TaskTemplate(
             target_language=self.target_language,
@@ -687,6 +948,12 @@ class TestResources(TestMixin, unittest.TestCase):
         )
         self.assertEqual(retrieved_resource.resource_id, resource.resource_id)
 
+    def test_add_resource_manual_nonexistent_word(self):
+        with self.assertRaises(ValueDoesNotExistInDB):
+            self.db_manager.add_resource_manual(
+                "test resourse", set([self.word_1, LexicalItem("blah", "NOUN", 1, 99999)])
+            )
+
     def test_resources_by_target_word(self):
         with session_manager(self.db_manager):
             target_word = self.word_1
@@ -880,6 +1147,23 @@ class TestTasks(TestMixin, unittest.TestCase):
             set(word.id for word in target_words),
         )
 
+    def test_add_task_unknown_parameter(self):
+        """
+        Test that adding a task with a resource for a parameter the template does not have fails.
+        """
+        resources = dict(self.resources)
+        resources["not_a_parameter"] = self.resource1
+        with self.assertRaises(ValueDoesNotExistInDB):
+            self.db_manager.add_task(
+                template_id=self.template_id,
+                resources=resources,
+                target_words={self.word_1},
+                answer="The correct translation",
+            )
+
+        with self.db_manager.Session() as session:
+            self.assertEqual(len(session.scalars(select(TaskDBObj)).all()), 0)
+
     def test_get_tasks_by_type(self):
         """
         Test by adding three tasks with two tasks of same task type and returning those.
@@ -1203,6 +1487,89 @@ class TestUserLessonData(TestMixin, unittest.TestCase):
                 )
                 self.assertEqual(retr_history.task.id, history.task.id)
 
+class TestLessonPlan(TestMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        with session_manager(self.db_manager):
+            template_id = add_template(self.db_manager)
+            select_words = {self.db_manager.get_word_by_id(self.word_ids[0])}
+            self.task1 = create_example_task(self.db_manager, "task1-r1", "task1-r2", select_words, template_id)
+            self.task2 = create_example_task(self.db_manager, "task2-r1", "task2-r2", select_words, template_id)
+            self.task3 = create_example_task(self.db_manager, "task3-r1", "task3-r2", select_words, template_id)
+
+    def test_next_task_follows_plan_order(self):
+        lesson_plan = [
+            (self.task1, [CorrectionStrategy.HintStrategy]),
+            (self.task2, []),
+        ]
+        with session_manager(self.db_manager):
+            lesson_head = self.db_manager.save_lesson_plan(self.user_id, lesson_plan)
+        lesson_id = lesson_head["lesson_id"]
+
+        with session_manager(self.db_manager):
+            retrieved_head = self.db_manager.retrieve_lesson(self.user_id)
+        self.assertEqual(retrieved_head["lesson_id"], lesson_id)
+        self.assertEqual(retrieved_head["first_task"]["order"], Order(0, 0))
+        self.assertEqual(retrieved_head["first_task"]["task"].id, self.task1.id)
+
+        # after the first attempt the hint correction is due, carrying the evaluation
+        with session_manager(self.db_manager):
+            self.db_manager.save_evaluation_for_task(
+                self.user_id, lesson_id, Order(0, 0),
+                HistoryEntry(self.task1, "response1", {Score(self.word_ids[0], 3)})
+            )
+        with session_manager(self.db_manager):
+            next_task = self.db_manager.get_next_task_for_lesson(self.user_id, lesson_id)
+        self.assertEqual(next_task["order"], Order(0, 1))
+        self.assertIsNone(next_task["task"])
+        self.assertEqual(next_task["error_correction"], CorrectionStrategy.HintStrategy)
+        self.assertEqual(len(next_task["eval"].history), 1)
+
+        with session_manager(self.db_manager):
+            self.db_manager.update_lesson_plan_with_task(self.user_id, lesson_id, self.task3, Order(0, 1))
+            self.db_manager.save_evaluation_for_task(
+                self.user_id, lesson_id, Order(0, 1),
+                HistoryEntry(self.task3, "response2", {Score(self.word_ids[0], 8)})
+            )
+        with session_manager(self.db_manager):
+            next_task = self.db_manager.get_next_task_for_lesson(self.user_id, lesson_id)
+        self.assertEqual(next_task["order"], Order(1, 0))
+        self.assertEqual(next_task["task"].id, self.task2.id)
+
+    def test_save_evaluation_for_task_marks_its_plan_task(self):
+        # task1 is planned twice, the evaluation belongs to the second one only
+        lesson_plan = [
+            (self.task1, [CorrectionStrategy.HintStrategy]),
+            (self.task2, []),
+            (self.task1, []),
+        ]
+        with session_manager(self.db_manager):
+            lesson_id = self.db_manager.save_lesson_plan(self.user_id, lesson_plan)["lesson_id"]
+        with session_manager(self.db_manager):
+            self.db_manager.save_evaluation_for_task(
+                self.user_id, lesson_id, Order(2, 0),
+                HistoryEntry(self.task1, "response", {Score(self.word_ids[0], 6)})
+            )
+
+        with self.db_manager.Session() as session:
+            completed_orders = session.execute(
+                select(LessonPlanTaskDBObj.sequence_num, LessonPlanTaskDBObj.attempt_num)
+                .where(LessonPlanTaskDBObj.completed == True)
+            ).all()
+        self.assertEqual(completed_orders, [(2, 0)])
+        self.assertIsNone(self.db_manager.get_evaluation_for_task(self.user_id, lesson_id, Order(0, 0)))
+        evaluation = self.db_manager.get_evaluation_for_task(self.user_id, lesson_id, Order(2, 0))
+        self.assertEqual(len(evaluation.history), 1)
+        self.assertEqual(evaluation.history[0].task.id, self.task1.id)
+
+        # the hint slot has no task to evaluate yet
+        with session_manager(self.db_manager):
+            with self.assertRaises(ValueDoesNotExistInDB):
+                self.db_manager.save_evaluation_for_task(
+                    self.user_id, lesson_id, Order(0, 1),
+                    HistoryEntry(self.task1, "response", {Score(self.word_ids[0], 6)})
+                )
+
 class TestRetrieveWordsForLesson(TestMixin, unittest.TestCase):
     def setUp(self):
         super().setUp()
@@ -1283,11 +1650,114 @@ class TestRetrieveWordsForLesson(TestMixin, unittest.TestCase):
         self.assertEqual(set(retrieved_words), expected_words)
         self.assertEqual(len(retrieved_words), 3)  # Only three words should be returned
 
+class TestReadWordChunks(unittest.TestCase):
+    def tearDown(self):
+        if os.path.exists(TEST_WORD_FILE):
+            os.remove(TEST_WORD_FILE)
+
+    def test_no_words_requested_does_not_read_the_file(self):
+        # the file does not exist, so reading it would raise
+        self.assertEqual(list(read_word_chunks_from_file(TEST_WORD_FILE, 0)), [])
+        self.assertEqual(list(read_word_chunks_from_file(TEST_WORD_FILE, -1)), [])
+
+    def test_reads_counts_beyond_int32(self):
+        with open(TEST_WORD_FILE, "w") as f:
+            f.write("word\tpos\tcount\nthe\tDET\t5000000000\nrare\tNOUN\t2\napple\tNOUN\t50\n")
+        chunks = list(read_word_chunks_from_file(TEST_WORD_FILE, 10))
+        self.assertEqual(chunks, [[("the", "DET", 5000000000), ("apple", "NOUN", 50)]])
+
+class TestFileDatabase(unittest.TestCase):
+    def setUp(self):
+        remove_test_db_files()
+        self.app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': f'sqlite:///{TEST_DB_FILE}'})
+        self.db_manager: DatabaseManager = self.app.db_manager
+
+    def tearDown(self):
+        self.db_manager.close()
+        remove_test_db_files()
+
+    def test_new_file_uses_incremental_auto_vacuum(self):
+        with self.db_manager.Session() as session:
+            auto_vacuum = session.execute(text("PRAGMA auto_vacuum")).scalar()
+            journal_mode = session.execute(text("PRAGMA journal_mode")).scalar()
+        self.assertEqual(auto_vacuum, 2)  # INCREMENTAL
+        self.assertEqual(journal_mode, "wal")
+
+    def test_bulk_mode_turns_off_sync_and_restores_it(self):
+        def synchronous():
+            with session_manager(self.db_manager):
+                return self.db_manager.Session().execute(text("PRAGMA synchronous")).scalar()
+
+        with self.db_manager.bulk_mode():
+            self.assertEqual(synchronous(), 0)  # OFF
+        self.assertEqual(synchronous(), 1)  # NORMAL
+
+        # the connection is still held by the session when the load fails
+        with self.assertRaises(ValueError):
+            with self.db_manager.bulk_mode():
+                self.assertEqual(self.db_manager.Session().execute(text("PRAGMA synchronous")).scalar(), 0)
+                raise ValueError("load failed")
+        self.assertEqual(synchronous(), 1)
+
+    def test_discarded_app_closes_its_manager(self):
+        app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:'})
+        db_manager = app.db_manager
+        self.assertFalse(db_manager._closed)
+
+        del app
+        gc.collect()
+        self.assertTrue(db_manager._closed)
+
+    def test_engine_is_shared_per_database_and_echo(self):
+        engine = self.db_manager.Session.get_bind()
+        self.assertIs(get_db_engine(f'sqlite:///{TEST_DB_FILE}'), engine)
+
+        echo_app = create_app({
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': f'sqlite:///{TEST_DB_FILE}',
+            'SQLALCHEMY_ECHO': True,
+        })
+        echo_engine = echo_app.db_manager.Session.get_bind()
+        echo_app.db_manager.close()
+        self.assertIsNot(echo_engine, engine)
+        self.assertTrue(echo_engine.echo)
+        self.assertFalse(engine.echo)
+
+    def test_close_releases_cached_engine(self):
+        engine = self.db_manager.Session.get_bind()
+        self.db_manager.close()
+        self.db_manager.close()  # closing again does nothing
+
+        self.assertIsNot(get_db_engine(f'sqlite:///{TEST_DB_FILE}'), engine)
+
+    def test_close_frees_deleted_pages(self):
+        with session_manager(self.db_manager):
+            word_ids = self.db_manager.add_words_to_db(
+                [(f"word{i}" * 20, "NOUN", i) for i in range(3000)]
+            )
+        with self.db_manager.Session() as session:
+            session.execute(delete(WordDBObj).where(WordDBObj.id.in_(word_ids)))
+            session.commit()
+            self.assertGreater(session.execute(text("PRAGMA freelist_count")).scalar(), 0)
+
+        self.db_manager.close()
+
+        with closing(sqlite3.connect(TEST_DB_FILE)) as connection:
+            self.assertEqual(connection.execute("PRAGMA freelist_count").fetchone()[0], 0)
+
 
 """
 HELPER FUNCTIONS
 """
 
+def remove_test_db_files():
+    """
+    Removes the file database used by tests together with its WAL files.
+    """
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(TEST_DB_FILE + suffix):
+            os.remove(TEST_DB_FILE + suffix)
+
 def add_template(db_manager: DatabaseManager) -> int:
         """
         Adds an example template to the database and return its id.